@@ -40,7 +40,12 @@ def __init__(_distributor: address, _controller: address):
 
 
 @internal
-def _distribute_for(gauge_addr: address, _for: address):
+def _checkpoint_for(gauge_addr: address, _for: address) -> uint256:
+    """
+    @notice Checkpoint `_for` in `gauge_addr` and record what is owed to it
+    @dev The caller is responsible for transferring the returned amount
+    @return Amount to distribute to `_for` for `gauge_addr`
+    """
     assert GaugeController(self.controller).gauge_types(gauge_addr) >= 0  # dev: gauge is not added
 
     LiquidityGauge(gauge_addr).user_checkpoint(_for)
@@ -48,11 +53,20 @@ def _distribute_for(gauge_addr: address, _for: address):
     to_distribute: uint256 = total_distribute - self.distributed[_for][gauge_addr]
 
     if to_distribute != 0:
-        Distributor(self.distributor).distribute(_for, to_distribute)
         self.distributed[_for][gauge_addr] = total_distribute
 
         log Distributed(_for, gauge_addr, total_distribute)
 
+    return to_distribute
+
+
+@internal
+def _distribute_for(gauge_addr: address, _for: address):
+    to_distribute: uint256 = self._checkpoint_for(gauge_addr, _for)
+
+    if to_distribute != 0:
+        Distributor(self.distributor).distribute(_for, to_distribute)
+
 
 @external
 @nonreentrant('lock')
@@ -69,12 +83,17 @@ def distribute(gauge_addr: address):
 def distribute_many(gauge_addrs: address[8]):
     """
     @notice Distribute everything which belongs to `msg.sender` across multiple gauges
+    @dev Amounts owed by each gauge are summed up and distributed with a single transfer
     @param gauge_addrs List of `LiquidityGauge` addresses
     """
+    to_distribute: uint256 = 0
     for i in range(8):
         if gauge_addrs[i] == ZERO_ADDRESS:
             break
-        self._distribute_for(gauge_addrs[i], msg.sender)
+        to_distribute += self._checkpoint_for(gauge_addrs[i], msg.sender)
+
+    if to_distribute != 0:
+        Distributor(self.distributor).distribute(msg.sender, to_distribute)
 
 
 @external
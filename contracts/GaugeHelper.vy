@@ -0,0 +1,79 @@
+# @version 0.2.15
+"""
+@title GaugeHelper
+@license MIT
+@notice Batch reads and checkpoints for `GaugeController` gauges
+"""
+
+interface GaugeController:
+    def checkpoint(): nonpayable
+    def checkpoint_gauge(addr: address): nonpayable
+    def gauge_relative_weight(addr: address, time: uint256) -> uint256: view
+
+
+MAX_GAUGES: constant(uint256) = 32
+
+
+controller: public(address)
+
+
+@external
+def __init__(_controller: address):
+    """
+    @notice Contract constructor
+    @param _controller `GaugeController` contract address
+    """
+    assert _controller != ZERO_ADDRESS
+
+    self.controller = _controller
+
+
+@external
+@view
+def gauge_relative_weights(_gauges: address[MAX_GAUGES], _times: uint256[MAX_GAUGES]) -> uint256[MAX_GAUGES]:
+    """
+    @notice Get relative weights for a list of gauges
+    @param _gauges List of gauge addresses, terminated by ZERO_ADDRESS
+    @param _times Timestamp for each gauge, 0 means `block.timestamp`
+    @return Relative weights normalized to 1e18, in the same order as `_gauges`
+    """
+    _controller: address = self.controller
+    weights: uint256[MAX_GAUGES] = empty(uint256[MAX_GAUGES])
+
+    for i in range(MAX_GAUGES):
+        if _gauges[i] == ZERO_ADDRESS:
+            break
+        _time: uint256 = _times[i]
+        if _time == 0:
+            _time = block.timestamp
+        weights[i] = GaugeController(_controller).gauge_relative_weight(_gauges[i], _time)
+
+    return weights
+
+
+@external
+def checkpoint_gauges(_gauges: address[MAX_GAUGES], _gas_budget: uint256) -> uint256:
+    """
+    @notice Checkpoint the controller and a list of gauges
+    @dev Stops before the next gauge once `_gas_budget` has been spent on
+         gauges, call again with the remaining gauges to continue.
+         The budget is only checked after the first gauge, so at least
+         one gauge is always checkpointed.
+    @param _gauges List of gauge addresses, terminated by ZERO_ADDRESS
+    @param _gas_budget Gas that can be spent checkpointing gauges, 0 for no limit
+    @return Number of gauges checkpointed
+    """
+    _controller: address = self.controller
+    GaugeController(_controller).checkpoint()
+    gas_start: uint256 = msg.gas
+
+    n: uint256 = 0
+    for i in range(MAX_GAUGES):
+        if _gauges[i] == ZERO_ADDRESS:
+            break
+        if _gas_budget != 0 and n != 0 and gas_start - msg.gas >= _gas_budget:
+            break
+        GaugeController(_controller).checkpoint_gauge(_gauges[i])
+        n += 1
+
+    return n
@@ -12,6 +12,10 @@ interface LiquidityGauge:
     def accept_transfer_ownership(): nonpayable
 
 
+MAX_GAUGES: constant(uint256) = 20
+MAX_REWARDS: constant(uint256) = 8
+
+
 event CommitAdmins:
     ownership_admin: address
     emergency_admin: address
@@ -117,3 +121,72 @@ def set_rewards(_gauge: address, _reward_contract: address, _sigs: bytes32, _rew
     assert msg.sender == self.ownership_admin, "Access denied"
 
     LiquidityGauge(_gauge).set_rewards(_reward_contract, _sigs, _reward_tokens)
+
+
+@external
+@nonreentrant('lock')
+def commit_transfer_ownership_many(_gauges: address[MAX_GAUGES], new_owner: address):
+    """
+    @notice Transfer ownership for multiple liquidity gauges to `new_owner`
+    @param _gauges List of gauge addresses, terminated by ZERO_ADDRESS
+    @param new_owner New gauges owner address
+    """
+    assert msg.sender == self.ownership_admin, "Access denied"
+
+    for i in range(MAX_GAUGES):
+        if _gauges[i] == ZERO_ADDRESS:
+            break
+        LiquidityGauge(_gauges[i]).commit_transfer_ownership(new_owner)
+
+
+@external
+@nonreentrant('lock')
+def accept_transfer_ownership_many(_gauges: address[MAX_GAUGES]):
+    """
+    @notice Apply transferring ownership of multiple gauges
+    @param _gauges List of gauge addresses, terminated by ZERO_ADDRESS
+    """
+    for i in range(MAX_GAUGES):
+        if _gauges[i] == ZERO_ADDRESS:
+            break
+        LiquidityGauge(_gauges[i]).accept_transfer_ownership()
+
+
+@external
+@nonreentrant('lock')
+def set_killed_many(_gauges: address[MAX_GAUGES], _is_killed: bool[MAX_GAUGES]):
+    """
+    @notice Set the killed status for multiple gauges
+    @param _gauges List of gauge addresses, terminated by ZERO_ADDRESS
+    @param _is_killed Killed status to set for each gauge
+    """
+    assert msg.sender in [self.ownership_admin, self.emergency_admin], "Access denied"
+
+    for i in range(MAX_GAUGES):
+        if _gauges[i] == ZERO_ADDRESS:
+            break
+        LiquidityGauge(_gauges[i]).set_killed(_is_killed[i])
+
+
+@external
+@nonreentrant('lock')
+def set_rewards_many(
+    _gauges: address[MAX_GAUGES],
+    _reward_contracts: address[MAX_GAUGES],
+    _sigs: bytes32[MAX_GAUGES],
+    _reward_tokens: address[MAX_REWARDS][MAX_GAUGES]
+):
+    """
+    @notice Set the active reward contract for multiple gauges
+    @dev See `set_rewards` for the meaning of each gauge configuration
+    @param _gauges List of gauge addresses, terminated by ZERO_ADDRESS
+    @param _reward_contracts Reward contract address for each gauge
+    @param _sigs Four byte selectors for staking, withdrawing and claiming for each gauge
+    @param _reward_tokens List of claimable tokens for each gauge
+    """
+    assert msg.sender == self.ownership_admin, "Access denied"
+
+    for i in range(MAX_GAUGES):
+        if _gauges[i] == ZERO_ADDRESS:
+            break
+        LiquidityGauge(_gauges[i]).set_rewards(_reward_contracts[i], _sigs[i], _reward_tokens[i])
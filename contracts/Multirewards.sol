@@ -7,20 +7,24 @@ import {OwnableUpgradeable as Ownable} from "@oz-upgradeable/access/OwnableUpgra
 import {IERC20Upgradeable as IERC20} from "@oz-upgradeable/token/ERC20/IERC20Upgradeable.sol";
 import {PausableUpgradeable as Pausable} from "@oz-upgradeable/security/PausableUpgradeable.sol";
 import {SafeERC20Upgradeable as SafeERC20} from "@oz-upgradeable/token/ERC20/utils/SafeERC20Upgradeable.sol";
+import {SafeCastUpgradeable as SafeCast} from "@oz-upgradeable/utils/math/SafeCastUpgradeable.sol";
 import {ReentrancyGuardUpgradeable as ReentrancyGuard} from "@oz-upgradeable/security/ReentrancyGuardUpgradeable.sol";
 
 contract MultiRewards is Ownable, ReentrancyGuard, Pausable {
   using SafeERC20 for IERC20;
+  using SafeCast for uint256;
 
   /* ========== STATE VARIABLES ========== */
 
+  // packed in 3 slots: (shouldTransfer, rewardsDistributor, rewardsDuration),
+  // (periodFinish, rewardRate, lastUpdateTime) and rewardPerTokenStored
   struct Reward {
     bool shouldTransfer;
     address rewardsDistributor;
-    uint256 rewardsDuration;
-    uint256 periodFinish;
-    uint256 rewardRate;
-    uint256 lastUpdateTime;
+    uint64 rewardsDuration;
+    uint64 periodFinish;
+    uint128 rewardRate;
+    uint64 lastUpdateTime;
     uint256 rewardPerTokenStored;
   }
   IERC20 public stakingToken;
@@ -59,7 +63,7 @@ contract MultiRewards is Ownable, ReentrancyGuard, Pausable {
     require(rewardData[_rewardsToken].rewardsDuration == 0);
     rewardTokens.push(_rewardsToken);
     rewardData[_rewardsToken].rewardsDistributor = _rewardsDistributor;
-    rewardData[_rewardsToken].rewardsDuration = _rewardsDuration;
+    rewardData[_rewardsToken].rewardsDuration = _rewardsDuration.toUint64();
     rewardData[_rewardsToken].shouldTransfer = _shouldTransfer;
   }
 
@@ -91,7 +95,7 @@ contract MultiRewards is Ownable, ReentrancyGuard, Pausable {
   }
 
   function getRewardForDuration(address _rewardsToken) external view returns (uint256) {
-    return rewardData[_rewardsToken].rewardRate * rewardData[_rewardsToken].rewardsDuration;
+    return uint256(rewardData[_rewardsToken].rewardRate) * rewardData[_rewardsToken].rewardsDuration;
   }
 
   /* ========== MUTATIVE FUNCTIONS ========== */
@@ -144,15 +148,15 @@ contract MultiRewards is Ownable, ReentrancyGuard, Pausable {
     }
 
     if (block.timestamp >= rewardData[_rewardsToken].periodFinish) {
-      rewardData[_rewardsToken].rewardRate = reward / rewardData[_rewardsToken].rewardsDuration;
+      rewardData[_rewardsToken].rewardRate = (reward / rewardData[_rewardsToken].rewardsDuration).toUint128();
     } else {
       uint256 remaining = rewardData[_rewardsToken].periodFinish - block.timestamp;
       uint256 leftover = remaining * rewardData[_rewardsToken].rewardRate;
-      rewardData[_rewardsToken].rewardRate = (reward + leftover) / rewardData[_rewardsToken].rewardsDuration;
+      rewardData[_rewardsToken].rewardRate = ((reward + leftover) / rewardData[_rewardsToken].rewardsDuration).toUint128();
     }
 
-    rewardData[_rewardsToken].lastUpdateTime = block.timestamp;
-    rewardData[_rewardsToken].periodFinish = block.timestamp + rewardData[_rewardsToken].rewardsDuration;
+    rewardData[_rewardsToken].lastUpdateTime = block.timestamp.toUint64();
+    rewardData[_rewardsToken].periodFinish = (block.timestamp + rewardData[_rewardsToken].rewardsDuration).toUint64();
     emit RewardAdded(reward);
   }
 
@@ -171,7 +175,7 @@ contract MultiRewards is Ownable, ReentrancyGuard, Pausable {
     );
     require(rewardData[_rewardsToken].rewardsDistributor == msg.sender);
     require(_rewardsDuration > 0, "Reward duration must be non-zero");
-    rewardData[_rewardsToken].rewardsDuration = _rewardsDuration;
+    rewardData[_rewardsToken].rewardsDuration = _rewardsDuration.toUint64();
     emit RewardsDurationUpdated(_rewardsToken, rewardData[_rewardsToken].rewardsDuration);
   }
 
@@ -190,18 +194,42 @@ contract MultiRewards is Ownable, ReentrancyGuard, Pausable {
   /* ========== MODIFIERS ========== */
 
   modifier updateReward(address account) {
-    address[] memory _rewardsToken = rewardTokens;
+    _updateReward(account);
+    _;
+  }
+
+  /// @dev Same accounting as `rewardPerToken` and `earned`, but storage is only
+  /// written when something changed: tokens whose period finished (or with no
+  /// time elapsed) keep their reward data, and users already up to date keep
+  /// their rewards.
+  function _updateReward(address account) internal {
+    uint256 _length = rewardTokens.length;
+    uint256 _supply = _totalSupply;
+    uint256 _balance = account != address(0) ? _balances[account] : 0;
+
+    for (uint256 i; i < _length; i++) {
+      address token = rewardTokens[i];
+      Reward storage data = rewardData[token];
+      uint256 _rewardPerToken = data.rewardPerTokenStored;
+
+      uint256 _lastUpdateTime = data.lastUpdateTime;
+      uint256 _lastTime = Math.min(block.timestamp, data.periodFinish);
+      if (_lastTime > _lastUpdateTime) {
+        if (_supply != 0) {
+          _rewardPerToken += (_lastTime - _lastUpdateTime) * data.rewardRate * 1e18 / _supply;
+          data.rewardPerTokenStored = _rewardPerToken;
+        }
+        data.lastUpdateTime = uint64(_lastTime);
+      }
 
-    for (uint256 i; i < _rewardsToken.length; i++) {
-      address token = _rewardsToken[i];
-      rewardData[token].rewardPerTokenStored = rewardPerToken(token);
-      rewardData[token].lastUpdateTime = lastTimeRewardApplicable(token);
       if (account != address(0)) {
-        rewards[account][token] = earned(account, token);
-        userRewardPerTokenPaid[account][token] = rewardData[token].rewardPerTokenStored;
+        uint256 _paid = userRewardPerTokenPaid[account][token];
+        if (_paid != _rewardPerToken) {
+          rewards[account][token] += _balance * (_rewardPerToken - _paid) / 1e18;
+          userRewardPerTokenPaid[account][token] = _rewardPerToken;
+        }
       }
     }
-    _;
   }
 
   /* ========== EVENTS ========== */
@@ -108,6 +108,10 @@ integrate_fraction: public(HashMap[address, uint256])
 
 inflation_rate: public(uint256)
 
+# [uint128 week][uint128 relative weight] of the week this gauge last
+# checkpointed the controller in, weights of past weeks are final
+relative_weight_cache: uint256
+
 # For tracking external rewards
 reward_data: uint256
 reward_tokens: public(address[MAX_REWARDS])
@@ -206,9 +210,17 @@ def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
 
 
 @internal
-def _checkpoint_rewards( _user: address, _total_supply: uint256, _claim: bool, _receiver: address):
+def _checkpoint_rewards(
+    _user: address,
+    _total_supply: uint256,
+    _claim: bool,
+    _receiver: address,
+    _other_user: address
+):
     """
     @notice Claim pending rewards and checkpoint rewards for a user
+    @dev Reward tokens are read from storage once. When `_other_user` is set
+         it is checkpointed (never claimed) against the same reward integrals
     """
     # load reward tokens and integrals into memory
     reward_tokens: address[MAX_REWARDS] = empty(address[MAX_REWARDS])
@@ -216,6 +228,9 @@ def _checkpoint_rewards( _user: address, _total_supply: uint256, _claim: bool, _
     for i in range(MAX_REWARDS):
         token: address = self.reward_tokens[i]
         if token == ZERO_ADDRESS:
+            if i == 0:
+                # no rewards, e.g. `claim_rewards` on a gauge without any
+                return
             break
         reward_tokens[i] = token
         reward_integrals[i] = self.reward_integral[token]
@@ -225,7 +240,7 @@ def _checkpoint_rewards( _user: address, _total_supply: uint256, _claim: bool, _
         # track balances prior to claiming
         reward_balances: uint256[MAX_REWARDS] = empty(uint256[MAX_REWARDS])
         for i in range(MAX_REWARDS):
-            token: address = self.reward_tokens[i]
+            token: address = reward_tokens[i]
             if token == ZERO_ADDRESS:
                 break
             reward_balances[i] = ERC20(token).balanceOf(self)
@@ -245,35 +260,38 @@ def _checkpoint_rewards( _user: address, _total_supply: uint256, _claim: bool, _
                 reward_integrals[i] += dI
                 self.reward_integral[token] = reward_integrals[i]
 
-    if _user != ZERO_ADDRESS:
+    for user in [_user, _other_user]:
+        if user == ZERO_ADDRESS:
+            continue
 
+        claim: bool = _claim and user == _user
         receiver: address = _receiver
-        if _claim and receiver == ZERO_ADDRESS:
+        if claim and receiver == ZERO_ADDRESS:
             # if receiver is not explicitly declared, check for default receiver
-            receiver = self.rewards_receiver[_user]
+            receiver = self.rewards_receiver[user]
             if receiver == ZERO_ADDRESS:
                 # direct claims to user if no default receiver is set
-                receiver = _user
+                receiver = user
 
         # calculate new user reward integral and transfer any owed rewards
-        user_balance: uint256 = self.balanceOf[_user]
+        user_balance: uint256 = self.balanceOf[user]
         for i in range(MAX_REWARDS):
             token: address = reward_tokens[i]
             if token == ZERO_ADDRESS:
                 break
 
             integral: uint256 = reward_integrals[i]
-            integral_for: uint256 = self.reward_integral_for[token][_user]
+            integral_for: uint256 = self.reward_integral_for[token][user]
             new_claimable: uint256 = 0
             if integral_for < integral:
-                self.reward_integral_for[token][_user] = integral
+                self.reward_integral_for[token][user] = integral
                 new_claimable = user_balance * (integral - integral_for) / 10**18
 
-            claim_data: uint256 = self.claim_data[_user][token]
+            claim_data: uint256 = self.claim_data[user][token]
             total_claimable: uint256 = shift(claim_data, -128) + new_claimable
             if total_claimable > 0:
                 total_claimed: uint256 = claim_data % 2 ** 128
-                if _claim:
+                if claim:
                     response: Bytes[32] = raw_call(
                         token,
                         concat(
@@ -286,10 +304,10 @@ def _checkpoint_rewards( _user: address, _total_supply: uint256, _claim: bool, _
                     if len(response) != 0:
                         assert convert(response, bool)
                     # update amount claimed (lower order bytes)
-                    self.claim_data[_user][token] = total_claimed + total_claimable
+                    self.claim_data[user][token] = total_claimed + total_claimable
                 elif new_claimable > 0:
                     # update total_claimable (higher order bytes)
-                    self.claim_data[_user][token] = total_claimed + shift(total_claimable, 128)
+                    self.claim_data[user][token] = total_claimed + shift(total_claimable, 128)
 
 
 @internal
@@ -318,13 +336,22 @@ def _checkpoint(addr: address):
     if block.timestamp > _period_time:
         _working_supply: uint256 = self.working_supply
         _controller: address = self.controller
-        Controller(_controller).checkpoint_gauge(self)
+        this_week: uint256 = block.timestamp / WEEK * WEEK
+        weight_cache: uint256 = self.relative_weight_cache
+        cached_week: uint256 = shift(weight_cache, -128)
+        if cached_week != this_week:
+            # the controller was already checkpointed this week otherwise
+            Controller(_controller).checkpoint_gauge(self)
         prev_week_time: uint256 = _period_time
         week_time: uint256 = min((_period_time + WEEK) / WEEK * WEEK, block.timestamp)
 
+        w: uint256 = 0
         for i in range(500):
             dt: uint256 = week_time - prev_week_time
-            w: uint256 = Controller(_controller).gauge_relative_weight(self, prev_week_time / WEEK * WEEK)
+            if prev_week_time / WEEK * WEEK == cached_week:
+                w = weight_cache % 2**128
+            else:
+                w = Controller(_controller).gauge_relative_weight(self, prev_week_time / WEEK * WEEK)
 
             if _working_supply > 0:
                 if prev_future_epoch >= prev_week_time and prev_future_epoch < week_time:
@@ -350,6 +377,10 @@ def _checkpoint(addr: address):
             prev_week_time = week_time
             week_time = min(week_time + WEEK, block.timestamp)
 
+        if cached_week != this_week and prev_week_time / WEEK * WEEK == this_week:
+            # the last week in the loop is the current one
+            self.relative_weight_cache = shift(this_week, 128) + w
+
     _period += 1
     self.period = _period
     self.period_timestamp[_period] = block.timestamp
@@ -445,7 +476,7 @@ def claimable_reward_write(_addr: address, _token: address) -> uint256:
     @return uint256 Claimable reward token amount
     """
     if self.reward_tokens[0] != ZERO_ADDRESS:
-        self._checkpoint_rewards(_addr, self.totalSupply, False, ZERO_ADDRESS)
+        self._checkpoint_rewards(_addr, self.totalSupply, False, ZERO_ADDRESS, ZERO_ADDRESS)
     return shift(self.claim_data[_addr][_token], -128)
 
 
@@ -471,7 +502,7 @@ def claim_rewards(_addr: address = msg.sender, _receiver: address = ZERO_ADDRESS
     """
     if _receiver != ZERO_ADDRESS:
         assert _addr == msg.sender  # dev: cannot redirect when claiming for another user
-    self._checkpoint_rewards(_addr, self.totalSupply, True, _receiver)
+    self._checkpoint_rewards(_addr, self.totalSupply, True, _receiver, ZERO_ADDRESS)
 
 
 @external
@@ -511,7 +542,7 @@ def deposit(_value: uint256, _addr: address = msg.sender, _claim_rewards: bool =
         is_rewards: bool = self.reward_tokens[0] != ZERO_ADDRESS
         total_supply: uint256 = self.totalSupply
         if is_rewards:
-            self._checkpoint_rewards(_addr, total_supply, _claim_rewards, ZERO_ADDRESS)
+            self._checkpoint_rewards(_addr, total_supply, _claim_rewards, ZERO_ADDRESS, ZERO_ADDRESS)
 
         total_supply += _value
         new_balance: uint256 = self.balanceOf[_addr] + _value
@@ -549,7 +580,7 @@ def withdraw(_value: uint256, _claim_rewards: bool = False):
         is_rewards: bool = self.reward_tokens[0] != ZERO_ADDRESS
         total_supply: uint256 = self.totalSupply
         if is_rewards:
-            self._checkpoint_rewards(msg.sender, total_supply, _claim_rewards, ZERO_ADDRESS)
+            self._checkpoint_rewards(msg.sender, total_supply, _claim_rewards, ZERO_ADDRESS, ZERO_ADDRESS)
 
         total_supply -= _value
         new_balance: uint256 = self.balanceOf[msg.sender] - _value
@@ -580,15 +611,14 @@ def _transfer(_from: address, _to: address, _value: uint256):
 
     if _value != 0:
         total_supply: uint256 = self.totalSupply
-        is_rewards: bool = self.reward_tokens[0] != ZERO_ADDRESS
-        if is_rewards:
-            self._checkpoint_rewards(_from, total_supply, False, ZERO_ADDRESS)
+        if self.reward_tokens[0] != ZERO_ADDRESS:
+            # claim once and checkpoint both users against the same integrals
+            self._checkpoint_rewards(_from, total_supply, False, ZERO_ADDRESS, _to)
+
         new_balance: uint256 = self.balanceOf[_from] - _value
         self.balanceOf[_from] = new_balance
         self._update_liquidity_limit(_from, new_balance, total_supply)
 
-        if is_rewards:
-            self._checkpoint_rewards(_to, total_supply, False, ZERO_ADDRESS)
         new_balance = self.balanceOf[_to] + _value
         self.balanceOf[_to] = new_balance
         self._update_liquidity_limit(_to, new_balance, total_supply)
@@ -709,7 +739,7 @@ def set_rewards(_reward_contract: address, _sigs: bytes32, _reward_tokens: addre
     current_reward_contract: address = convert(self.reward_data % 2**160, address)
     total_supply: uint256 = self.totalSupply
     if self.reward_tokens[0] != ZERO_ADDRESS:
-        self._checkpoint_rewards(ZERO_ADDRESS, total_supply, False, ZERO_ADDRESS)
+        self._checkpoint_rewards(ZERO_ADDRESS, total_supply, False, ZERO_ADDRESS, ZERO_ADDRESS)
     if current_reward_contract != ZERO_ADDRESS:
         withdraw_sig: Bytes[4] = slice(self.reward_sigs, 4, 4)
         if convert(withdraw_sig, uint256) != 0:
@@ -767,7 +797,7 @@ def set_rewards(_reward_contract: address, _sigs: bytes32, _reward_tokens: addre
 
     if _reward_contract != ZERO_ADDRESS:
         # do an initial checkpoint to verify that claims are working
-        self._checkpoint_rewards(ZERO_ADDRESS, total_supply, False, ZERO_ADDRESS)
+        self._checkpoint_rewards(ZERO_ADDRESS, total_supply, False, ZERO_ADDRESS, ZERO_ADDRESS)
 
 
 @external
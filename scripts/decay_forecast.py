@@ -0,0 +1,272 @@
+from brownie import Contract, network, web3
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+import click
+
+WEEK = 7 * 86400
+MAX_WEEKS = 208  # VotingEscrow MAXTIME rounded to weeks
+MULTIPLIER = 10 ** 18
+
+GAUGE_CONTROLLER = '0xaC69078141f76A1e257Ee889920d02Cc547d632f'
+VOTING_ESCROW = '0xaac13a116ea7016689993193fce4badc8038136f'
+
+VOTE_FOR_GAUGE = '0x' + keccak(text='VoteForGauge(uint256,address,address,uint256)').hex()
+DEPOSIT = '0x' + keccak(text='Deposit(address,uint256,uint256,int128,uint256)').hex()
+
+
+class DecayForecaster:
+    """
+    Forecast how gauge weights decay if nobody votes again.
+
+    Mirrors `GaugeController._get_weight`: starting from the gauge point
+    (bias, slope) at `origin`, every week the bias drops by `slope * WEEK`
+    and the slope drops by the sum of the vote slopes ending that week.
+    Vote slopes and escrow locks are bucketed by their (week aligned) end.
+    """
+
+    def __init__(self, origin, weeks=MAX_WEEKS):
+        self.origin = origin // WEEK * WEEK
+        self.weeks = weeks
+
+        self.gauges = []  # ordered list of gauge addresses (matrix rows)
+        self.type_weights = {}  # gauge -> type weight
+        self.points = {}  # gauge -> [bias, slope, time]
+        self.votes = {}  # (user, gauge) -> (slope, end)
+        self.slope_changes = {}  # gauge -> end -> slope
+        self.locks = {}  # user -> (amount, end)
+        self.lock_calendar = {}  # end -> user -> amount
+
+        self._rows = {}
+        self._dirty = set()
+
+    # state loading
+
+    def set_gauge(self, gauge, type_weight, bias, slope, time=None):
+        """
+        Set the gauge point, as stored in `points_weight[gauge][time]`.
+        Points older than `origin` are decayed forward on the next read.
+        """
+        if gauge not in self.points:
+            self.gauges.append(gauge)
+            self.slope_changes[gauge] = {}
+        self.type_weights[gauge] = type_weight
+        self.points[gauge] = [bias, slope, self.origin if time is None else time]
+        self._dirty.add(gauge)
+
+    def set_vote(self, user, gauge, slope, end):
+        """
+        Index a vote already accounted for in the gauge point
+        (i.e. loaded from `vote_user_slopes`)
+        """
+        t = self.points[gauge][2]
+        old_slope, old_end = self.votes.get((user, gauge), (0, 0))
+        if old_end > t:
+            self._bucket_slope(gauge, old_end, -old_slope)
+        if end > t:
+            self._bucket_slope(gauge, end, slope)
+        self.votes[(user, gauge)] = (slope, end)
+        self._dirty.add(gauge)
+
+    def set_lock(self, user, amount, end):
+        old_amount, old_end = self.locks.get(user, (0, 0))
+        if old_end in self.lock_calendar:
+            self.lock_calendar[old_end].pop(user, None)
+            if not self.lock_calendar[old_end]:
+                del self.lock_calendar[old_end]
+        if amount > 0:
+            self.locks[user] = (amount, end)
+            self.lock_calendar.setdefault(end, {})[user] = amount
+        else:
+            self.locks.pop(user, None)
+
+    def _bucket_slope(self, gauge, end, slope):
+        changes = self.slope_changes[gauge]
+        changes[end] = changes.get(end, 0) + slope
+        if changes[end] == 0:
+            del changes[end]
+
+    def _sync(self, gauge):
+        # decay the gauge point up to `origin`, consuming past slope changes
+        point = self.points[gauge]
+        changes = self.slope_changes[gauge]
+        while point[2] < self.origin:
+            point[2] += WEEK
+            d_bias = point[1] * WEEK
+            if point[0] > d_bias:
+                point[0] -= d_bias
+                point[1] -= changes.pop(point[2], 0)
+            else:
+                point[0] = 0
+                point[1] = 0
+                changes.pop(point[2], None)
+
+    # incremental updates
+
+    def advance(self, timestamp):
+        """
+        Move the forecast origin to the week of `timestamp`
+        """
+        t = timestamp // WEEK * WEEK
+        if t <= self.origin:
+            return
+        self.origin = t
+        for gauge in self.gauges:
+            self._sync(gauge)
+        for end in [end for end in self.lock_calendar if end <= t]:
+            for user in self.lock_calendar.pop(end):
+                self.locks.pop(user, None)
+        self._dirty.update(self.gauges)
+
+    def on_vote(self, timestamp, user, gauge, slope, end):
+        """
+        Apply a `VoteForGauge` the same way `vote_for_gauge_weights` does
+        @param slope Vote slope as stored in `vote_user_slopes`
+        @param end Lock end as stored in `vote_user_slopes`
+        """
+        next_time = (timestamp + WEEK) // WEEK * WEEK
+        self.advance(next_time)
+
+        old_slope, old_end = self.votes.get((user, gauge), (0, 0))
+        old_bias = old_slope * (old_end - next_time) if old_end > next_time else 0
+        new_bias = slope * (end - next_time)
+
+        point = self.points[gauge]
+        point[0] = max(point[0] + new_bias, old_bias) - old_bias
+        if old_end > next_time:
+            point[1] = max(point[1] + slope, old_slope) - old_slope
+        else:
+            point[1] += slope
+
+        # slope changes up to `origin` were already consumed by `advance`
+        if old_end > self.origin:
+            self._bucket_slope(gauge, old_end, -old_slope)
+        self._bucket_slope(gauge, end, slope)
+        self.votes[(user, gauge)] = (slope, end)
+        self._dirty.add(gauge)
+
+    def on_lock(self, user, amount, end):
+        self.set_lock(user, amount, end)
+
+    # forecast
+
+    def matrix(self):
+        """
+        Gauge weights for the next `weeks` weeks, one row per gauge.
+        Only the rows touched since the last call are recomputed.
+        """
+        dirty = [g for g in self.gauges if g in self._dirty]
+        if dirty:
+            for gauge in dirty:
+                self._sync(gauge)
+            biases = [self.points[g][0] for g in dirty]
+            slopes = [self.points[g][1] for g in dirty]
+            changes = [self.slope_changes[g] for g in dirty]
+            rows = [[b] for b in biases]
+
+            t = self.origin
+            for _ in range(self.weeks - 1):
+                t += WEEK
+                for i in range(len(dirty)):
+                    d_bias = slopes[i] * WEEK
+                    if biases[i] > d_bias:
+                        biases[i] -= d_bias
+                        slopes[i] -= changes[i].get(t, 0)
+                    else:
+                        biases[i] = 0
+                        slopes[i] = 0
+                    rows[i].append(biases[i])
+
+            for gauge, row in zip(dirty, rows):
+                self._rows[gauge] = row
+            self._dirty.clear()
+
+        return [self._rows[g] for g in self.gauges]
+
+    def relative_matrix(self):
+        """
+        Relative weights (1e18 == 100%) assuming type weights do not change
+        """
+        rows = self.matrix()
+        weighted = [
+            [self.type_weights[g] * w for w in row] for g, row in zip(self.gauges, rows)
+        ]
+        totals = [sum(col) for col in zip(*weighted)] if weighted else []
+        return [
+            [MULTIPLIER * w // total if total else 0 for w, total in zip(row, totals)]
+            for row in weighted
+        ]
+
+    def calendar(self):
+        """
+        Week -> (unlocked escrow amount, vote slope expiring per gauge)
+        """
+        weeks = {}
+        for end, users in self.lock_calendar.items():
+            weeks.setdefault(end, [0, {}])[0] += sum(users.values())
+        for gauge, changes in self.slope_changes.items():
+            for end, slope in changes.items():
+                weeks.setdefault(end, [0, {}])[1][gauge] = slope
+        return dict(sorted(weeks.items()))
+
+
+def _topic_address(topic):
+    return to_checksum_address(HexBytes(topic)[-20:])
+
+
+def load_forecaster(controller, voting_escrow, from_block, weeks=MAX_WEEKS):
+    """
+    Build a `DecayForecaster` from on-chain state, indexing voters from the
+    `VoteForGauge` events and lockers from the escrow `Deposit` events
+    """
+    t = network.chain.time()
+    origin = (t + WEEK) // WEEK * WEEK
+    forecaster = DecayForecaster(origin, weeks)
+
+    for i in range(controller.n_gauges()):
+        gauge = controller.gauges(i)
+        type_weight = controller.get_type_weight(controller.gauge_types(gauge))
+        # the last scheduled point, decayed forward if nobody checkpointed lately
+        last = min(controller.time_weight(gauge), origin)
+        bias, slope = controller.points_weight(gauge, last)
+        forecaster.set_gauge(gauge, type_weight, bias, slope, last)
+
+    voters = set()
+    logs = web3.eth.getLogs({
+        'fromBlock': from_block, 'toBlock': 'latest',
+        'address': controller.address, 'topics': [VOTE_FOR_GAUGE],
+    })
+    for log in logs:
+        data = HexBytes(log['data'])
+        voters.add((_topic_address(data[32:64]), _topic_address(data[64:96])))
+    for user, gauge in voters:
+        slope, _, end = controller.vote_user_slopes(user, gauge)
+        forecaster.set_vote(user, gauge, slope, end)
+
+    lockers = set()
+    logs = web3.eth.getLogs({
+        'fromBlock': from_block, 'toBlock': 'latest',
+        'address': voting_escrow.address, 'topics': [DEPOSIT],
+    })
+    for log in logs:
+        lockers.add(_topic_address(log['topics'][1]))
+    for user in lockers:
+        amount, end = voting_escrow.locked(user)
+        forecaster.set_lock(user, amount, end)
+
+    return forecaster
+
+
+def main():
+    from_block = click.prompt("From block", type=int)
+    weeks = click.prompt("Weeks", type=int, default=MAX_WEEKS)
+
+    controller = Contract(GAUGE_CONTROLLER)
+    voting_escrow = Contract(VOTING_ESCROW)
+    forecaster = load_forecaster(controller, voting_escrow, from_block, weeks)
+
+    for gauge, row in zip(forecaster.gauges, forecaster.relative_matrix()):
+        print(gauge, ' '.join(f'{w / 1e16:.2f}%' for w in row[:12]))
+
+    for week, (unlocked, slopes) in forecaster.calendar().items():
+        print(f'{week}: {unlocked / 1e18:.2f} unlocked, {len(slopes)} gauges lose slope')
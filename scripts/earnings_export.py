@@ -0,0 +1,403 @@
+from brownie import Contract, ZERO_ADDRESS, web3
+from collections import namedtuple
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+import click
+import csv
+import json
+import os
+import random
+import resource
+import time
+
+WEEK = 7 * 86400
+MAX_REWARDS = 8
+BLOCK_CHUNK = 2000  # blocks per `eth_getLogs` request
+ROWS_PER_PART = 100_000  # rows buffered before writing a parquet part
+
+GAUGE_CONTROLLER = '0xaC69078141f76A1e257Ee889920d02Cc547d632f'
+DISTRIBUTOR_PROXY = '0x074306BC6a6Fc1bD02B425dd41D742ADf36Ca9C6'
+IDLE = '0x875773784Af8135eA0ef43b5a374AaD105c5D39e'
+
+UPDATE_LIQUIDITY_LIMIT = '0x' + keccak(text='UpdateLiquidityLimit(address,uint256,uint256,uint256,uint256)').hex()
+DISTRIBUTED = '0x' + keccak(text='Distributed(address,address,uint256)').hex()
+TRANSFER = '0x' + keccak(text='Transfer(address,address,uint256)').hex()
+
+COLUMNS = ('week', 'gauge', 'user', 'token', 'earned', 'distributed', 'claimed')
+
+# cumulative amount observed at `block`: `field` is the index of the
+# `earned`, `distributed` or `claimed` column it accrues to
+Record = namedtuple('Record', 'block timestamp gauge user token field total')
+EARNED, DISTRIBUTED_FIELD, CLAIMED = range(3)
+
+
+def weekly_rows(records, end_block, end_time, baseline=None):
+    """
+    Turn cumulative records into per-week, per-gauge, per-user, per-token deltas.
+
+    A delta is booked in the week of the record that observed it. Gauges only
+    update `integrate_fraction` and the reward totals when the user is
+    checkpointed, so a user idle for several weeks gets all of it in the week
+    of their next checkpoint, not spread over the weeks it accrued in.
+
+    Records must come in block order. Only the last total of each
+    (gauge, user, token, field) and the deltas of the current week are kept,
+    so memory does not depend on the history length.
+
+    @param records Iterable of `Record`
+    @param end_block Last block covered by `records`
+    @param end_time Timestamp of `end_block`, weeks ending after it are left open
+    @param baseline Callable (gauge, user) -> {(token, field): total} giving the
+                    totals before the first record, everything is 0 if not set
+    @return Generator of (cursor, rows): the rows of a closed week and the block
+            to resume from once they are written
+    """
+    last = {}  # (gauge, user) -> (token, field) -> total
+    amounts = {}  # (gauge, user, token) -> [earned, distributed, claimed]
+    week = None
+
+    for r in records:
+        t = r.timestamp // WEEK * WEEK
+        if t != week:
+            if week is not None:
+                yield r.block, _rows(week, amounts)
+                amounts = {}
+            week = t
+
+        totals = last.get((r.gauge, r.user))
+        if totals is None:
+            totals = last[(r.gauge, r.user)] = dict(baseline(r.gauge, r.user)) if baseline else {}
+        key = (r.token, r.field)
+        delta = r.total - totals.get(key, 0)
+        totals[key] = r.total
+        if delta:
+            row = amounts.get((r.gauge, r.user, r.token))
+            if row is None:
+                row = amounts[(r.gauge, r.user, r.token)] = [0, 0, 0]
+            row[r.field] += delta
+
+    # the last week is only complete if `end_block` is past its end
+    if week is None or week + WEEK <= end_time:
+        yield end_block + 1, _rows(week, amounts)
+
+
+def _rows(week, amounts):
+    return [[week, *key, *values] for key, values in sorted(amounts.items())]
+
+
+# on-chain source
+
+def _topic_address(topic):
+    return to_checksum_address(HexBytes(topic)[-20:])
+
+
+def _address_topic(address):
+    return '0x' + address[2:].lower().rjust(64, '0')
+
+
+def _reward_tokens(gauge, block):
+    tokens = []
+    if not web3.eth.getCode(gauge.address, block):
+        return tokens
+    for i in range(MAX_REWARDS):
+        token = gauge.reward_tokens(i, block_identifier=block)
+        if token == ZERO_ADDRESS:
+            break
+        tokens.append(token)
+    return tokens
+
+
+def _read_totals(gauge, user, tokens, block):
+    totals = {(IDLE, EARNED): gauge.integrate_fraction(user, block_identifier=block)}
+    for token in tokens:
+        claimed = gauge.claimed_reward(user, token, block_identifier=block)
+        claimable = gauge.claimable_reward(user, token, block_identifier=block)
+        totals[(token, EARNED)] = claimed + claimable
+        totals[(token, CLAIMED)] = claimed
+    return totals
+
+
+def chain_records(gauges, distributor_proxy, from_block, to_block, chunk=BLOCK_CHUNK):
+    """
+    Stream `Record`s for `gauges` between `from_block` and `to_block`.
+
+    Users are checkpointed whenever a gauge logs `UpdateLiquidityLimit` (deposit,
+    withdraw, transfer, user_checkpoint, kick) or sends a reward token (claims,
+    the receiver and the transaction sender are checked). Their totals are then
+    read at that block. Logs are fetched `chunk` blocks at a time.
+    @dev A claim for another user redirected to a third receiver is only
+         accounted for at that user's next checkpoint
+    """
+    by_address = {g.address: g for g in gauges}
+    gauge_topics = [_address_topic(g) for g in by_address]
+
+    for start in range(from_block, to_block + 1, chunk):
+        end = min(start + chunk - 1, to_block)
+        tokens = {g: _reward_tokens(by_address[g], end) for g in by_address}
+        all_tokens = sorted({t for ts in tokens.values() for t in ts})
+
+        touched = {}  # block -> {(gauge, user)}
+        distributed = {}  # block -> [(gauge, user, total)]
+        senders = {}  # tx hash -> sender
+
+        logs = web3.eth.getLogs({
+            'fromBlock': start, 'toBlock': end,
+            'address': list(by_address), 'topics': [UPDATE_LIQUIDITY_LIMIT],
+        })
+        for log in logs:
+            user = _topic_address(HexBytes(log['data'])[:32])
+            touched.setdefault(log['blockNumber'], set()).add((log['address'], user))
+
+        if all_tokens:
+            logs = web3.eth.getLogs({
+                'fromBlock': start, 'toBlock': end,
+                'address': all_tokens, 'topics': [TRANSFER, gauge_topics],
+            })
+            for log in logs:
+                gauge = _topic_address(log['topics'][1])
+                tx_hash = log['transactionHash']
+                if tx_hash not in senders:
+                    senders[tx_hash] = web3.eth.getTransaction(tx_hash)['from']
+                sender = senders[tx_hash]
+                users = touched.setdefault(log['blockNumber'], set())
+                users.add((gauge, _topic_address(log['topics'][2])))
+                users.add((gauge, sender))
+
+        logs = web3.eth.getLogs({
+            'fromBlock': start, 'toBlock': end,
+            'address': distributor_proxy.address, 'topics': [DISTRIBUTED],
+        })
+        for log in logs:
+            data = HexBytes(log['data'])
+            gauge = _topic_address(data[:32])
+            if gauge in by_address:
+                user = _topic_address(log['topics'][1])
+                distributed.setdefault(log['blockNumber'], []).append(
+                    (gauge, user, int.from_bytes(data[32:64], 'big'))
+                )
+
+        for block in sorted(touched.keys() | distributed.keys()):
+            timestamp = web3.eth.getBlock(block)['timestamp']
+            for gauge, user in sorted(touched.get(block, ())):
+                totals = _read_totals(by_address[gauge], user, tokens[gauge], block)
+                for (token, field), total in totals.items():
+                    yield Record(block, timestamp, gauge, user, token, field, total)
+            for gauge, user, total in distributed.get(block, ()):
+                yield Record(block, timestamp, gauge, user, IDLE, DISTRIBUTED_FIELD, total)
+
+
+def chain_baseline(gauges, distributor_proxy, block):
+    """
+    Totals of every user at `block`, to resume `weekly_rows` right after it
+    """
+    by_address = {g.address: g for g in gauges if web3.eth.getCode(g.address, block)}
+    tokens = {g: _reward_tokens(by_address[g], block) for g in by_address}
+
+    def baseline(gauge, user):
+        if gauge not in by_address:
+            # deployed after `block`
+            return {}
+        totals = _read_totals(by_address[gauge], user, tokens[gauge], block)
+        totals[(IDLE, DISTRIBUTED_FIELD)] = distributor_proxy.distributed(user, gauge, block_identifier=block)
+        return totals
+
+    return baseline
+
+
+# sinks
+
+class CsvSink:
+    """
+    Append rows to a CSV file. The cursor stores the file size, rows
+    written after it are dropped when resuming.
+    """
+
+    def __init__(self, path, state=None):
+        self._file = open(path, 'a+', newline='')
+        if state is not None:
+            self._file.truncate(state['offset'])
+            self._file.seek(0, os.SEEK_END)
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def checkpoint(self, final=False):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {'offset': self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """
+    Write rows to numbered parquet parts in a directory, a part is written
+    once `rows_per_part` rows (whole weeks) are buffered. Amounts are stored
+    as decimal strings since they do not fit int64.
+    The cursor stores the next part number.
+    @dev Needs pyarrow, which is not a brownie dependency
+    """
+
+    def __init__(self, path, state=None, rows_per_part=ROWS_PER_PART):
+        import pyarrow  # noqa: F401
+
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.part = state['part'] if state is not None else 0
+        self.rows_per_part = rows_per_part
+        self._rows = []
+
+    def write(self, rows):
+        self._rows.extend(rows)
+
+    def checkpoint(self, final=False):
+        if not self._rows or (len(self._rows) < self.rows_per_part and not final):
+            return {'part': self.part} if final else None
+
+        import pyarrow
+        import pyarrow.parquet as pq
+
+        columns = list(zip(*self._rows))
+        table = pyarrow.table({
+            'week': pyarrow.array(columns[0], pyarrow.int64()),
+            **{name: pyarrow.array(columns[i], pyarrow.string()) for i, name in enumerate(COLUMNS[1:4], 1)},
+            **{name: pyarrow.array([str(v) for v in columns[i]], pyarrow.string()) for i, name in enumerate(COLUMNS[4:], 4)},
+        })
+        path = os.path.join(self.path, f'part-{self.part:05d}.parquet')
+        pq.write_table(table, path + '.tmp')
+        os.replace(path + '.tmp', path)
+        self.part += 1
+        self._rows = []
+        return {'part': self.part}
+
+    def close(self):
+        pass
+
+
+def load_cursor(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _save_cursor(path, cursor):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(cursor, f)
+    os.replace(path + '.tmp', path)
+
+
+def export(weeks, sink, cursor_path):
+    """
+    Write the output of `weekly_rows` to `sink`, saving the cursor (next block
+    and sink state) every time the sink makes rows durable
+    @return Number of rows written
+    """
+    n_rows = 0
+    cursor = None
+    for cursor, rows in weeks:
+        sink.write(rows)
+        n_rows += len(rows)
+        state = sink.checkpoint()
+        if state is not None:
+            _save_cursor(cursor_path, dict(state, block=cursor))
+    if cursor is not None:
+        _save_cursor(cursor_path, dict(sink.checkpoint(final=True), block=cursor))
+    sink.close()
+    return n_rows
+
+
+def open_sink(fmt, path, state=None):
+    return {'csv': CsvSink, 'parquet': ParquetSink}[fmt](path, state)
+
+
+# benchmark
+
+def synthetic_records(n_events, n_gauges=20, n_users=5000, n_tokens=2, events_per_block=3, block_time=12, seed=0):
+    """
+    Random cumulative history: each event checkpoints a user in a gauge
+    (IDLE earned plus `n_tokens` reward tokens), one in ten also distributes
+    """
+    rng = random.Random(seed)
+    gauges = [f'gauge{i}' for i in range(n_gauges)]
+    users = [f'user{i}' for i in range(n_users)]
+    tokens = [f'token{i}' for i in range(n_tokens)]
+    totals = {}
+
+    for i in range(n_events):
+        block = i // events_per_block
+        timestamp = block * block_time
+        gauge, user = rng.choice(gauges), rng.choice(users)
+        earned = totals.get((gauge, user, IDLE), 0) + rng.randrange(10 ** 18)
+        totals[(gauge, user, IDLE)] = earned
+        yield Record(block, timestamp, gauge, user, IDLE, EARNED, earned)
+        for token in tokens:
+            total = totals.get((gauge, user, token), 0) + rng.randrange(10 ** 18)
+            totals[(gauge, user, token)] = total
+            yield Record(block, timestamp, gauge, user, token, EARNED, total)
+            yield Record(block, timestamp, gauge, user, token, CLAIMED, total // 2)
+        if i % 10 == 0:
+            yield Record(block, timestamp, gauge, user, IDLE, DISTRIBUTED_FIELD, earned)
+
+
+def benchmark(n_events=3_000_000, fmt='csv', path='earnings_benchmark', **kwargs):
+    """
+    Export a synthetic history of `n_events` user checkpoints, reporting the
+    throughput and the peak resident memory of the process
+    """
+    end_block = (n_events - 1) // kwargs.get('events_per_block', 3)
+    end_time = end_block * kwargs.get('block_time', 12)
+    records = synthetic_records(n_events, **kwargs)
+    if fmt == 'csv':
+        path += '.csv'
+    for stale in (path, path + '.cursor'):
+        if os.path.isfile(stale):
+            os.remove(stale)
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.time()
+    n_rows = export(
+        weekly_rows(records, end_block, end_time),
+        open_sink(fmt, path),
+        path + '.cursor',
+    )
+    elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    print(
+        f'{n_events} events, {n_rows} rows in {elapsed:.1f}s ({n_events / elapsed:.0f} events/s), '
+        f'peak RSS {peak / 2 ** 20:.1f} MiB (+{(peak - rss) / 2 ** 20:.1f} MiB during the export)'
+    )
+    return n_rows, peak
+
+
+def main():
+    path = click.prompt("Output path")
+    fmt = click.prompt("Format", type=click.Choice(['csv', 'parquet']), default='csv')
+    to_block = click.prompt("To block", type=int, default=web3.eth.blockNumber)
+
+    cursor_path = path + '.cursor'
+    cursor = load_cursor(cursor_path)
+    if cursor is None:
+        from_block = click.prompt("From block", type=int)
+    else:
+        from_block = cursor['block']
+        print(f'Resuming from block {from_block}')
+
+    controller = Contract(GAUGE_CONTROLLER)
+    distributor_proxy = Contract(DISTRIBUTOR_PROXY)
+    gauges = [Contract(controller.gauges(i)) for i in range(controller.n_gauges())]
+
+    records = chain_records(gauges, distributor_proxy, from_block, to_block)
+    baseline = chain_baseline(gauges, distributor_proxy, from_block - 1) if from_block > 0 else None
+    end_time = web3.eth.getBlock(to_block)['timestamp']
+
+    sink = open_sink(fmt, path, cursor)
+    n_rows = export(weekly_rows(records, to_block, end_time, baseline), sink, cursor_path)
+    print(f'{n_rows} rows written, next block {load_cursor(cursor_path)["block"]}')
@@ -0,0 +1,86 @@
+from brownie import Contract, ZERO_ADDRESS, accounts
+
+import click
+
+MAX_GAUGES = 32  # GaugeHelper batch size
+
+GAUGE_CONTROLLER = '0xaC69078141f76A1e257Ee889920d02Cc547d632f'
+
+
+def _chunks(items, size=MAX_GAUGES):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _pad(items, value):
+    return list(items) + [value] * (MAX_GAUGES - len(items))
+
+
+class GaugeHelperClient:
+    """
+    Client for the `GaugeHelper` contract, splitting lists of any length
+    into `MAX_GAUGES` sized batches
+    """
+
+    def __init__(self, helper, controller):
+        self.helper = helper
+        self.controller = controller
+
+    def gauges(self):
+        return [self.controller.gauges(i) for i in range(self.controller.n_gauges())]
+
+    def relative_weights(self, gauges=None, times=None):
+        """
+        Get `gauge_relative_weight` for each gauge (all gauges by default)
+        @param times Timestamp for each gauge, a single timestamp or None for now
+        @return Dict gauge -> relative weight
+        """
+        gauges = self.gauges() if gauges is None else list(gauges)
+        if times is None or isinstance(times, int):
+            times = [times or 0] * len(gauges)
+
+        weights = {}
+        for batch, batch_times in zip(_chunks(gauges), _chunks(list(times))):
+            result = self.helper.gauge_relative_weights(
+                _pad(batch, ZERO_ADDRESS), _pad(batch_times, 0)
+            )
+            weights.update(zip(batch, result[:len(batch)]))
+        return weights
+
+    def checkpoint(self, tx_params, gauges=None, gas_budget=0):
+        """
+        Checkpoint the controller and the gauges (all gauges by default),
+        sending as many transactions as the gas budget requires
+        @dev The budget is sent with each transaction, so it also holds on-chain
+        @return List of transactions sent
+        """
+        gauges = self.gauges() if gauges is None else list(gauges)
+        txs = []
+        while gauges:
+            batch = gauges[:MAX_GAUGES]
+            # dry-run to find how many gauges fit in the budget: reading the
+            # return value of a sent transaction needs `debug_traceTransaction`
+            if gas_budget:
+                count = self.helper.checkpoint_gauges.call(
+                    _pad(batch, ZERO_ADDRESS), gas_budget, tx_params
+                )
+                if count == 0:
+                    raise ValueError(f"No gauge checkpointed with a gas budget of {gas_budget}")
+                batch = batch[:count]
+            txs.append(self.helper.checkpoint_gauges(_pad(batch, ZERO_ADDRESS), gas_budget, tx_params))
+            gauges = gauges[len(batch):]
+        return txs
+
+
+def main():
+    helper_address = click.prompt("GaugeHelper address")
+    helper = Contract(helper_address)
+    client = GaugeHelperClient(helper, Contract(GAUGE_CONTROLLER))
+
+    for gauge, weight in client.relative_weights().items():
+        print(f'{gauge}: {weight / 1e16:.2f}%')
+
+    if click.confirm("Checkpoint all gauges?"):
+        sender = accounts.load(click.prompt("Account", type=click.Choice(accounts.load())))
+        gas_budget = click.prompt("Gas budget", type=int, default=0)
+        client.checkpoint({'from': sender}, gas_budget=gas_budget)
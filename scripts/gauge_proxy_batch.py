@@ -0,0 +1,88 @@
+from brownie import Contract, ZERO_ADDRESS
+from eth_utils import function_signature_to_4byte_selector
+
+import click
+import json
+
+MAX_GAUGES = 20  # GaugeProxy batch size
+MAX_REWARDS = 8
+
+GAUGE_PROXY = '0xBb1CB94F14881DDa38793d7F6F99d96Db0594051'
+
+# Multirewards stake / withdraw / getReward selectors
+MULTIREWARDS_SIGS = ['stake(uint256)', 'withdraw(uint256)', 'getReward()']
+
+
+def _pad(items, value, size=MAX_GAUGES):
+    return list(items) + [value] * (size - len(items))
+
+
+def encode_sigs(sigs):
+    """
+    Pack deposit, withdraw and claim signatures into the `bytes32` expected by
+    `set_rewards`, an empty signature is encoded as 0x00000000
+    """
+    packed = b''.join(
+        function_signature_to_4byte_selector(sig) if sig else b'\x00' * 4 for sig in sigs
+    )
+    return '0x' + packed.ljust(32, b'\x00').hex()
+
+
+def build_batches(manifest):
+    """
+    Build the GaugeProxy batch calls described by `manifest`.
+
+    The manifest is a dict with a `gauges` list, every entry has an `address`
+    and optionally:
+      - `killed`: killed status to set
+      - `reward_contract`, `reward_tokens` and `sigs` (Multirewards signatures
+        by default): reward configuration to set
+    and an optional `new_owner` to commit the ownership of every gauge to.
+
+    @return List of (method name, args) tuples, at most `MAX_GAUGES` gauges each
+    """
+    gauges = manifest['gauges']
+    calls = []
+
+    killed = [g for g in gauges if 'killed' in g]
+    for i in range(0, len(killed), MAX_GAUGES):
+        batch = killed[i:i + MAX_GAUGES]
+        calls.append(('set_killed_many', (
+            _pad([g['address'] for g in batch], ZERO_ADDRESS),
+            _pad([bool(g['killed']) for g in batch], False),
+        )))
+
+    rewards = [g for g in gauges if 'reward_contract' in g]
+    for i in range(0, len(rewards), MAX_GAUGES):
+        batch = rewards[i:i + MAX_GAUGES]
+        calls.append(('set_rewards_many', (
+            _pad([g['address'] for g in batch], ZERO_ADDRESS),
+            _pad([g['reward_contract'] for g in batch], ZERO_ADDRESS),
+            _pad([encode_sigs(g.get('sigs', MULTIREWARDS_SIGS)) for g in batch], '0x' + '00' * 32),
+            _pad(
+                [_pad(g.get('reward_tokens', []), ZERO_ADDRESS, MAX_REWARDS) for g in batch],
+                [ZERO_ADDRESS] * MAX_REWARDS,
+            ),
+        )))
+
+    if manifest.get('new_owner'):
+        for i in range(0, len(gauges), MAX_GAUGES):
+            batch = gauges[i:i + MAX_GAUGES]
+            calls.append(('commit_transfer_ownership_many', (
+                _pad([g['address'] for g in batch], ZERO_ADDRESS),
+                manifest['new_owner'],
+            )))
+
+    return calls
+
+
+def main():
+    path = click.prompt("Manifest path")
+    with open(path) as f:
+        manifest = json.load(f)
+
+    gauge_proxy = Contract(manifest.get('gauge_proxy', GAUGE_PROXY))
+
+    # GaugeProxy is owned by the timelock: print the calldata to queue
+    for method, args in build_batches(manifest):
+        print(f'{method}: {getattr(gauge_proxy, method).encode_input(*args)}')
@@ -0,0 +1,240 @@
+import json
+import os
+import time
+
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+
+from brownie import web3
+from brownie.network import state
+
+BUDGETS = os.path.join(os.path.dirname(__file__), "perf_budgets.json")
+REPORT = os.path.join("reports", "perf.json")
+
+TX_METHODS = ("eth_sendTransaction", "eth_sendRawTransaction")
+TIME_GRACE = 1.0  # seconds added to every time budget, to absorb noise on short tests
+APART = ("shared_setup", "revert_checks")  # measured but left out of the budgets
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "test-suite performance budgets")
+    group.addoption(
+        "--perf", action="store_true", help="Record wall time, RPC calls, transactions and blocks mined per test"
+    )
+    group.addoption("--perf-report", default=REPORT, help=f"JSON report path (default: {REPORT})")
+    group.addoption("--perf-budgets", default=BUDGETS, help="Budgets file to compare against")
+    group.addoption(
+        "--perf-update-budgets", action="store_true", help="Write the measured values as the new budgets"
+    )
+    group.addoption(
+        "--perf-rpc-tolerance", type=float, default=0.1, help="Allowed RPC calls growth over budget (default: 0.1)"
+    )
+    group.addoption(
+        "--perf-time-tolerance", type=float, default=0.5, help="Allowed wall time growth over budget (default: 0.5)"
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("perf"):
+        config.pluginmanager.register(PerfRecorder(config), "perf-recorder")
+
+
+def over_budget(metrics, budget, rpc_tolerance, time_tolerance):
+    """
+    @dev A budget may override the tolerances, e.g. for tests drawing random actions
+    @return List of (metric, measured, allowed) exceeding `budget`
+    """
+    rpc_tolerance = budget.get("rpc_tolerance", rpc_tolerance)
+    time_tolerance = budget.get("time_tolerance", time_tolerance)
+    exceeded = []
+    if "rpc_calls" in budget:
+        allowed = int(budget["rpc_calls"] * (1 + rpc_tolerance))
+        if metrics["rpc_calls"] > allowed:
+            exceeded.append(("rpc_calls", metrics["rpc_calls"], allowed))
+    if "time" in budget:
+        allowed = budget["time"] * (1 + time_tolerance) + TIME_GRACE
+        if metrics["time"] > allowed:
+            exceeded.append(("time", metrics["time"], allowed))
+    return exceeded
+
+
+class PerfRecorder:
+    """
+    Count the JSON-RPC requests sent through brownie's provider during each
+    test (setup and teardown included) and check them against the budgets.
+    Blocks mined are the transactions sent (ganache mines one block per
+    transaction) plus the `evm_mine` calls.
+
+    Setting up module or session fixtures is charged to whichever test needs
+    them first, and after each revert brownie checks the code of every contract
+    deployed earlier in the session. Both depend on the tests selected, they
+    are reported apart as `shared_setup` and `revert_checks` and left out of
+    the budgets.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.budgets_path = config.getoption("perf_budgets")
+        self.update = config.getoption("perf_update_budgets")
+        self.rpc_tolerance = config.getoption("perf_rpc_tolerance")
+        self.time_tolerance = config.getoption("perf_time_tolerance")
+
+        self.budgets = {}
+        if os.path.exists(self.budgets_path):
+            with open(self.budgets_path) as f:
+                self.budgets = json.load(f)
+
+        self.results = {}
+        self._calls = Counter()
+        self._provider = None
+        self._start = None
+        self._apart_calls = {name: Counter() for name in APART}
+        self._apart_time = dict.fromkeys(APART, 0.0)
+        self._in_apart = False
+
+    def _count_requests(self):
+        # brownie replaces the provider when (re)connecting
+        provider = web3.provider
+        if provider is None or provider is self._provider:
+            return
+        make_request = provider.make_request
+
+        def counting_make_request(method, params):
+            self._calls[method] += 1
+            return make_request(method, params)
+
+        provider.make_request = counting_make_request
+        # web3 caches the middleware stack wrapped around the original
+        # `make_request` on the first request, drop it so `web3.eth` calls
+        # go through the counter as well
+        provider._request_func_cache = (None, None)
+        self._provider = provider
+
+    @contextmanager
+    def _apart(self, name):
+        if self._in_apart:
+            # e.g. a revert while setting up a module fixture, counted once
+            yield
+            return
+        self._count_requests()
+        calls = self._calls.copy()
+        start = time.perf_counter()
+        self._in_apart = True
+        try:
+            yield
+        finally:
+            self._in_apart = False
+            self._apart_time[name] += time.perf_counter() - start
+            self._count_requests()
+            self._apart_calls[name].update(self._calls - calls)
+
+    def pytest_sessionstart(self, session):
+        notify_registry = state._notify_registry
+
+        def timed_notify_registry(*args, **kwargs):
+            if self._start is None:
+                return notify_registry(*args, **kwargs)
+            with self._apart("revert_checks"):
+                return notify_registry(*args, **kwargs)
+
+        # called by `Chain._revert`, look it up at call time
+        state._notify_registry = timed_notify_registry
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self._count_requests()
+        self._calls.clear()
+        for name in APART:
+            self._apart_calls[name].clear()
+            self._apart_time[name] = 0.0
+        self._start = time.perf_counter()
+        yield
+        # the chain may only be connected once the first test is set up
+        self._count_requests()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        if fixturedef.scope == "function" or self._start is None:
+            yield
+            return
+        with self._apart("shared_setup"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != "teardown" or self._start is None:
+            return
+
+        calls = self._calls - sum(self._apart_calls.values(), Counter())
+        calls = dict(sorted(calls.items()))
+        transactions = sum(calls.get(m, 0) for m in TX_METHODS)
+        metrics = {
+            "time": round(time.perf_counter() - self._start - sum(self._apart_time.values()), 3),
+            "rpc_calls": sum(calls.values()),
+            "rpc_by_method": calls,
+            "transactions": transactions,
+            "blocks_mined": transactions + calls.get("evm_mine", 0),
+        }
+        for name in APART:
+            metrics[name] = {
+                "time": round(self._apart_time[name], 3),
+                "rpc_calls": sum(self._apart_calls[name].values()),
+            }
+        self._start = None
+
+        budget = self.budgets.get(item.nodeid)
+        if budget is not None:
+            metrics["budget"] = budget
+            exceeded = over_budget(metrics, budget, self.rpc_tolerance, self.time_tolerance)
+            metrics["over_budget"] = [name for name, _, _ in exceeded]
+            report = outcome.get_result()
+            if exceeded and not self.update and report.passed:
+                report.outcome = "failed"
+                report.longrepr = "Performance budget exceeded: " + ", ".join(
+                    f"{name} {measured:g} > {allowed:g}" for name, measured, allowed in exceeded
+                )
+        self.results[item.nodeid] = metrics
+
+    def pytest_sessionfinish(self, session):
+        if not self.results or hasattr(self.config, "workerinput"):
+            return
+
+        path = self.config.getoption("perf_report")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"tests": self.results}, f, indent=2, sort_keys=True)
+
+        if self.update:
+            for nodeid, metrics in self.results.items():
+                budget = self.budgets.setdefault(nodeid, {})
+                budget.update(rpc_calls=metrics["rpc_calls"], time=metrics["time"])
+            with open(self.budgets_path, "w") as f:
+                json.dump(self.budgets, f, indent=2, sort_keys=True)
+                f.write("\n")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        tr = terminalreporter
+        tr.section("performance")
+        slowest = sorted(self.results.items(), key=lambda i: i[1]["time"], reverse=True)[:10]
+        for nodeid, metrics in slowest:
+            tr.write_line(
+                f"{metrics['time']:8.2f}s {metrics['rpc_calls']:7d} rpc {metrics['transactions']:6d} tx "
+                f"{metrics['blocks_mined']:6d} blocks  {nodeid}"
+            )
+        exceeded = [nodeid for nodeid, metrics in self.results.items() if metrics.get("over_budget")]
+        # entries with only tolerance overrides are not budgets yet
+        missing = [
+            nodeid for nodeid in self.results
+            if not {"rpc_calls", "time"} & self.budgets.get(nodeid, {}).keys()
+        ]
+        if exceeded:
+            tr.write_line(f"{len(exceeded)} tests over budget", red=True)
+        if missing and not self.update:
+            tr.write_line(f"{len(missing)} tests without a budget, run with --perf-update-budgets to add them")
+        tr.write_line(f"report written to {self.config.getoption('perf_report')}")
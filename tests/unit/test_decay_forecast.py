@@ -0,0 +1,98 @@
+import pytest
+
+from scripts.decay_forecast import DecayForecaster, load_forecaster
+
+MAX_UINT256 = 2 ** 256 - 1
+WEEK = 7 * 86400
+
+@pytest.fixture(scope="module")
+def fake_idle(ERC20LP, accounts):
+    yield ERC20LP.deploy("Fake IDLE", "fIDLE", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def voting_escrow(VotingEscrow, fake_idle, accounts):
+    yield VotingEscrow.deploy(fake_idle, 'Staked fIDLE', 'stkfIDLE', '1.0', {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauge_controller(GaugeController, accounts, voting_escrow):
+    yield GaugeController.deploy(voting_escrow, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauges(accounts, gauge_controller):
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    gauge_controller.add_gauge(accounts[8], 0, 10 ** 18, {"from": accounts[0]})
+    gauge_controller.add_gauge(accounts[9], 0, 0, {"from": accounts[0]})
+    yield accounts[8], accounts[9]
+
+def test_forecast_matches_controller(accounts, chain, fake_idle, voting_escrow, gauge_controller, gauges):
+    alice, bob = accounts[:2]
+    start_block = chain.height
+
+    fake_idle.transfer(bob, 10 ** 20, {"from": alice})
+    for user, weeks in ((alice, 10), (bob, 20)):
+        fake_idle.approve(voting_escrow, MAX_UINT256, {"from": user})
+        voting_escrow.create_lock(10 ** 20, chain.time() + weeks * WEEK, {"from": user})
+
+    gauge_controller.vote_for_gauge_weights(gauges[0], 5000, {"from": alice})
+    gauge_controller.vote_for_gauge_weights(gauges[1], 5000, {"from": alice})
+    gauge_controller.vote_for_gauge_weights(gauges[1], 10000, {"from": bob})
+
+    forecaster = load_forecaster(gauge_controller, voting_escrow, start_block, weeks=30)
+    weights = forecaster.matrix()
+
+    assert len(forecaster.lock_calendar) == 2
+
+    for week in range(1, 25):
+        chain.sleep(WEEK)
+        for i, gauge in enumerate(gauges):
+            gauge_controller.checkpoint_gauge(gauge, {"from": alice})
+            t = forecaster.origin + week * WEEK
+            assert gauge_controller.points_weight(gauge, t)[0] == weights[i][week]
+
+def test_forecast_incremental_vote(accounts, chain, fake_idle, voting_escrow, gauge_controller, gauges):
+    alice = accounts[2]
+
+    fake_idle.transfer(alice, 10 ** 20, {"from": accounts[0]})
+    fake_idle.approve(voting_escrow, MAX_UINT256, {"from": alice})
+    voting_escrow.create_lock(10 ** 20, chain.time() + 30 * WEEK, {"from": alice})
+    forecaster = load_forecaster(gauge_controller, voting_escrow, 0, weeks=30)
+    forecaster.matrix()
+
+    tx = gauge_controller.vote_for_gauge_weights(gauges[1], 10000, {"from": alice})
+    slope, _, end = gauge_controller.vote_user_slopes(alice, gauges[1])
+    forecaster.on_vote(tx.timestamp, alice, gauges[1], slope, end)
+
+    expected = load_forecaster(gauge_controller, voting_escrow, 0, weeks=30)
+    assert forecaster.matrix() == expected.matrix()
+    assert forecaster.relative_matrix() == expected.relative_matrix()
+
+def test_calendar_buckets_by_week():
+    forecaster = DecayForecaster(10 * WEEK, weeks=8)
+    forecaster.set_gauge("gauge", 1, 0, 0)
+    forecaster.set_lock("alice", 100, 12 * WEEK)
+    forecaster.set_lock("bob", 50, 12 * WEEK)
+    forecaster.on_vote(10 * WEEK - 1, "alice", "gauge", 3, 12 * WEEK)
+
+    assert forecaster.calendar() == {12 * WEEK: [150, {"gauge": 3}]}
+    assert forecaster.matrix()[0][:3] == [6 * WEEK, 3 * WEEK, 0]
+
+    forecaster.advance(13 * WEEK)
+    assert forecaster.calendar() == {}
+    assert forecaster.matrix()[0] == [0] * 8
+
+def test_revote_after_old_end_consumed():
+    forecaster = DecayForecaster(10 * WEEK, weeks=8)
+    forecaster.set_gauge("gauge", 1, 0, 0)
+    forecaster.set_lock("alice", 100, 12 * WEEK)
+    forecaster.on_vote(10 * WEEK - 5, "alice", "gauge", 3, 12 * WEEK)
+
+    # the old vote ends on the week the new one is applied from
+    forecaster.set_lock("alice", 100, 20 * WEEK)
+    forecaster.on_vote(11 * WEEK + 5, "alice", "gauge", 2, 20 * WEEK)
+
+    assert forecaster.calendar() == {20 * WEEK: [100, {"gauge": 2}]}
+    assert forecaster.matrix()[0][:3] == [16 * WEEK, 14 * WEEK, 12 * WEEK]
+
+    forecaster.advance(21 * WEEK)
+    assert forecaster.calendar() == {}
+    assert forecaster.locks == {}
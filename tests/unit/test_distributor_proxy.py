@@ -0,0 +1,104 @@
+import pytest
+
+from brownie import ZERO_ADDRESS
+
+MAX_UINT256 = 2 ** 256 - 1
+WEEK = 7 * 86400
+N_GAUGES = 8
+
+def approx(a, b, precision=1e-10):
+    if a == b == 0:
+        return True
+    return 2 * abs(a - b) / (a + b) <= precision
+
+@pytest.fixture(scope="module")
+def fake_idle(ERC20LP, accounts):
+    yield ERC20LP.deploy("Fake IDLE", "fIDLE", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def mock_lp_token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Idle YTP token", "YTP-LP", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def distributor(Distributor, fake_idle, accounts):
+    distr = Distributor.deploy(fake_idle, accounts[0], accounts[0], {"from": accounts[0]})
+    fake_idle.transfer(distr, fake_idle.balanceOf(accounts[0]) // 2, {'from': accounts[0]})
+    yield distr
+
+@pytest.fixture(scope="module")
+def voting_escrow(VotingEscrow, fake_idle, accounts):
+    yield VotingEscrow.deploy(fake_idle, 'Staked fIDLE', 'stkfIDLE', '1.0', {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauge_controller(GaugeController, accounts, voting_escrow):
+    yield GaugeController.deploy(voting_escrow, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def distributor_proxy(DistributorProxy, accounts, gauge_controller, distributor):
+    proxy = DistributorProxy.deploy(distributor, gauge_controller, {'from': accounts[0]})
+    distributor.setDistributorProxy(proxy, {'from': accounts[0]})
+    yield proxy
+
+@pytest.fixture(scope="module")
+def gauges(LiquidityGaugeV3, accounts, chain, mock_lp_token, distributor, distributor_proxy, gauge_controller):
+    alice = accounts[1]
+    mock_lp_token.transfer(alice, 10 ** 24, {"from": accounts[0]})
+
+    chain.mine(timedelta=86400 + 1)
+    distributor.updateDistributionParameters({"from": accounts[0]})
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+
+    gauges = []
+    for i in range(N_GAUGES):
+        gauge = LiquidityGaugeV3.deploy(mock_lp_token, distributor_proxy, accounts[0], {"from": accounts[0]})
+        gauge_controller.add_gauge(gauge, 0, (i + 1) * 10 ** 18, {"from": accounts[0]})
+        mock_lp_token.approve(gauge, MAX_UINT256, {"from": alice})
+        gauge.deposit(10 ** 21, {"from": alice})
+        gauges.append(gauge)
+
+    chain.sleep(2 * WEEK)
+    chain.mine()
+    yield gauges
+
+@pytest.mark.parametrize("n_gauges", [1, 2, 4, 8])
+def test_distribute_many_matches_distribute(accounts, chain, fake_idle, distributor, distributor_proxy, gauges, n_gauges):
+    alice = accounts[1]
+    selected = gauges[:n_gauges]
+    chain.snapshot()
+
+    single_gas = 0
+    for gauge in selected:
+        single_gas += distributor_proxy.distribute(gauge, {"from": alice}).gas_used
+    expected_balance = fake_idle.balanceOf(alice)
+    expected_distributed = [distributor_proxy.distributed(alice, g) for g in selected]
+    expected_total = distributor.distributed()
+
+    chain.revert()
+    chain.snapshot()
+    tx = distributor_proxy.distribute_many(selected + [ZERO_ADDRESS] * (8 - n_gauges), {"from": alice})
+
+    # amounts depend on the timestamp of each checkpoint, which differ by
+    # a few seconds between the two paths
+    assert approx(fake_idle.balanceOf(alice), expected_balance, 1e-4)
+    assert approx(distributor.distributed(), expected_total, 1e-4)
+    for gauge, expected in zip(selected, expected_distributed):
+        assert approx(distributor_proxy.distributed(alice, gauge), expected, 1e-4)
+
+    assert [distributor_proxy.distributed(alice, g) for g in selected] == [
+        g.integrate_fraction(alice) for g in selected
+    ]
+    assert fake_idle.balanceOf(alice) == sum(distributor_proxy.distributed(alice, g) for g in selected)
+    assert distributor.distributed() == fake_idle.balanceOf(alice)
+
+    assert len(tx.events["Distributed"]) == n_gauges
+    for event, gauge in zip(tx.events["Distributed"], selected):
+        assert event["recipient"] == alice
+        assert event["gauge"] == gauge
+        assert event["distributed"] == distributor_proxy.distributed(alice, gauge)
+
+    # gas is compared excluding the base cost of the extra transactions
+    print(f"{n_gauges} gauges: distribute_many {tx.gas_used} gas, distribute {single_gas} gas")
+    if n_gauges > 1:
+        assert tx.gas_used < single_gas - (n_gauges - 1) * 21000
+
+    chain.revert()
@@ -0,0 +1,202 @@
+import csv
+import tracemalloc
+
+import pytest
+
+from brownie import ZERO_ADDRESS
+
+from scripts.earnings_export import (
+    CLAIMED, DISTRIBUTED_FIELD, IDLE, CsvSink, ParquetSink, chain_baseline,
+    chain_records, export, load_cursor, synthetic_records, weekly_rows,
+)
+
+MAX_UINT256 = 2 ** 256 - 1
+WEEK = 7 * 86400
+
+@pytest.fixture(scope="module")
+def fake_idle(ERC20LP, accounts):
+    yield ERC20LP.deploy("Fake IDLE", "fIDLE", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def mock_lp_token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Idle YTP token", "YTP-LP", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def reward_token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Rewards", "RWRD", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def distributor(Distributor, fake_idle, accounts):
+    distr = Distributor.deploy(fake_idle, accounts[0], accounts[0], {"from": accounts[0]})
+    fake_idle.transfer(distr, fake_idle.balanceOf(accounts[0]) // 2, {'from': accounts[0]})
+    yield distr
+
+@pytest.fixture(scope="module")
+def voting_escrow(VotingEscrow, fake_idle, accounts):
+    yield VotingEscrow.deploy(fake_idle, 'Staked fIDLE', 'stkfIDLE', '1.0', {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauge_controller(GaugeController, accounts, voting_escrow):
+    yield GaugeController.deploy(voting_escrow, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def distributor_proxy(DistributorProxy, accounts, gauge_controller, distributor):
+    proxy = DistributorProxy.deploy(distributor, gauge_controller, {'from': accounts[0]})
+    distributor.setDistributorProxy(proxy, {'from': accounts[0]})
+    yield proxy
+
+@pytest.fixture(scope="module")
+def gauges(LiquidityGaugeV3, MultiRewards, accounts, chain, mock_lp_token, reward_token, distributor, distributor_proxy, gauge_controller):
+    admin, alice, bob = accounts[:3]
+    chain.mine(timedelta=86400 + 1)
+    distributor.updateDistributionParameters({"from": admin})
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": admin})
+
+    gauges = []
+    for i in range(2):
+        gauge = LiquidityGaugeV3.deploy(mock_lp_token, distributor_proxy, admin, {"from": admin})
+        gauge_controller.add_gauge(gauge, 0, 10 ** 18, {"from": admin})
+        for user in (alice, bob):
+            mock_lp_token.transfer(user, 10 ** 22, {"from": admin})
+            mock_lp_token.approve(gauge, MAX_UINT256, {"from": user})
+        gauges.append(gauge)
+
+    # extra rewards on the second gauge
+    gauges[1].deposit(10 ** 21, {"from": alice})
+    multirewards = MultiRewards.deploy({"from": admin})
+    multirewards.initialize(admin, mock_lp_token, {"from": admin})
+    multirewards.addReward(reward_token, admin, 4 * WEEK, True, {"from": admin})
+    reward_token.approve(multirewards, MAX_UINT256, {"from": admin})
+    multirewards.depositReward(reward_token, 10 ** 24, {"from": admin})
+    sigs = [
+        multirewards.stake.signature[2:],
+        multirewards.withdraw.signature[2:],
+        multirewards.getReward.signature[2:],
+    ]
+    sigs = f"0x{sigs[0]}{sigs[1]}{sigs[2]}{'00' * 20}"
+    gauges[1].set_rewards(multirewards, sigs, [reward_token] + [ZERO_ADDRESS] * 7, {"from": admin})
+
+    yield gauges
+
+@pytest.fixture(scope="module")
+def history(accounts, chain, distributor_proxy, gauges):
+    alice, bob = accounts[1:3]
+    gauges[0].deposit(10 ** 21, {"from": alice})
+    gauges[0].deposit(3 * 10 ** 21, {"from": bob})
+    gauges[1].deposit(10 ** 21, {"from": bob})
+
+    for i in range(4):
+        chain.sleep(WEEK // 2)
+        gauges[i % 2].withdraw(10 ** 19, {"from": bob})
+        gauges[1].claim_rewards({"from": alice})
+        distributor_proxy.distribute(gauges[0], {"from": alice})
+        chain.sleep(WEEK // 3)
+        gauges[0].transfer(bob, 10 ** 18, {"from": alice})
+        gauges[1].user_checkpoint(bob, {"from": bob})
+
+    # close the last week
+    chain.sleep(WEEK)
+    chain.mine()
+    yield chain.height
+
+def read_csv(path):
+    with open(path) as f:
+        return list(csv.reader(f))
+
+def run_export(gauges, distributor_proxy, chain, path, from_block, to_block):
+    records = chain_records(gauges, distributor_proxy, from_block, to_block, chunk=7)
+    baseline = chain_baseline(gauges, distributor_proxy, from_block - 1) if from_block > 0 else None
+    cursor = load_cursor(f"{path}.cursor")
+    return export(
+        weekly_rows(records, to_block, chain[to_block].timestamp, baseline),
+        CsvSink(path, cursor),
+        f"{path}.cursor",
+    )
+
+def test_export_matches_chain(accounts, chain, distributor_proxy, gauges, reward_token, history, tmp_path):
+    path = str(tmp_path / "earnings.csv")
+    run_export(gauges, distributor_proxy, chain, path, 0, history)
+    header, *rows = read_csv(path)
+    assert load_cursor(f"{path}.cursor")["block"] == history + 1
+
+    totals = {}
+    for week, gauge, user, token, earned, distributed, claimed in rows:
+        assert int(week) % WEEK == 0
+        total = totals.setdefault((gauge, user, token), [0, 0, 0])
+        for i, amount in enumerate((earned, distributed, claimed)):
+            total[i] += int(amount)
+
+    weeks = {int(row[0]) for row in rows}
+    assert len(weeks) >= 3
+
+    for user in accounts[1:3]:
+        for gauge in gauges:
+            earned, distributed, _ = totals.get((gauge.address, user.address, IDLE), [0, 0, 0])
+            assert earned == gauge.integrate_fraction(user)
+            assert distributed == distributor_proxy.distributed(user, gauge)
+
+        earned, _, claimed = totals[(gauges[1].address, user.address, reward_token.address)]
+        assert claimed == gauges[1].claimed_reward(user, reward_token)
+        assert earned == claimed + gauges[1].claimable_reward(user, reward_token)
+
+    # alice only claims from the second gauge, she never earns IDLE there
+    assert totals[(gauges[0].address, accounts[1].address, IDLE)][DISTRIBUTED_FIELD] > 0
+    assert (gauges[1].address, accounts[1].address, IDLE) not in totals
+    assert totals[(gauges[1].address, accounts[1].address, reward_token.address)][CLAIMED] > 0
+
+def test_resume_from_cursor(chain, distributor_proxy, gauges, history, tmp_path):
+    full = str(tmp_path / "full.csv")
+    run_export(gauges, distributor_proxy, chain, full, 0, history)
+
+    resumed = str(tmp_path / "resumed.csv")
+    run_export(gauges, distributor_proxy, chain, resumed, 0, history - 10)
+    # a week starting at the last block is not written yet either
+    cursor = load_cursor(f"{resumed}.cursor")["block"]
+    assert cursor <= history - 10
+    run_export(gauges, distributor_proxy, chain, resumed, cursor, history)
+
+    assert read_csv(resumed) == read_csv(full)
+
+def test_cursor_drops_uncommitted_rows(tmp_path):
+    path = str(tmp_path / "earnings.csv")
+    records = list(synthetic_records(3000, n_gauges=2, n_users=10, events_per_block=1, block_time=3600))
+    end_block = records[-1].block
+    export(weekly_rows(records, end_block, end_block * 3600), CsvSink(path), f"{path}.cursor")
+    expected = read_csv(path)
+
+    # a crash after writing rows but before saving the cursor
+    cursor = load_cursor(f"{path}.cursor")
+    with open(path, "a") as f:
+        f.write("garbage\n")
+    sink = CsvSink(path, cursor)
+    sink.close()
+    assert read_csv(path) == expected
+
+def test_parquet_matches_csv(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    records = list(synthetic_records(3000, n_gauges=2, n_users=10, events_per_block=1, block_time=3600))
+    end_block = records[-1].block
+
+    csv_path = str(tmp_path / "earnings.csv")
+    export(weekly_rows(records, end_block, end_block * 3600), CsvSink(csv_path), f"{csv_path}.cursor")
+    pq_path = str(tmp_path / "earnings")
+    export(weekly_rows(records, end_block, end_block * 3600), ParquetSink(pq_path, rows_per_part=100), f"{pq_path}.cursor")
+
+    parts = sorted((tmp_path / "earnings").iterdir())
+    assert len(parts) == load_cursor(f"{pq_path}.cursor")["part"] > 1
+    rows = [row for part in parts for row in pq.read_table(str(part)).to_pylist()]
+    assert [[str(v) for v in row.values()] for row in rows] == read_csv(csv_path)[1:]
+
+@pytest.mark.parametrize("n_events", [20_000, 200_000])
+def test_memory_does_not_grow_with_history(n_events):
+    # same users and gauges, 10x the history: the peak should stay put
+    tracemalloc.start()
+    n_rows = 0
+    records = synthetic_records(n_events, n_gauges=4, n_users=50, events_per_block=1, block_time=60)
+    for _, rows in weekly_rows(records, n_events, n_events * 60):
+        n_rows += len(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{n_events} events, {n_rows} rows, peak memory {peak / 2 ** 10:.0f} KiB")
+    assert peak < 2 * 2 ** 20
@@ -0,0 +1,110 @@
+import pytest
+import time
+
+from brownie import ZERO_ADDRESS
+
+from scripts.gauge_helper import GaugeHelperClient
+
+WEEK = 7 * 86400
+N_GAUGES = 16
+
+@pytest.fixture(scope="module")
+def fake_idle(ERC20LP, accounts):
+    yield ERC20LP.deploy("Fake IDLE", "fIDLE", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def voting_escrow(VotingEscrow, fake_idle, accounts):
+    yield VotingEscrow.deploy(fake_idle, 'Staked fIDLE', 'stkfIDLE', '1.0', {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauge_controller(GaugeController, accounts, voting_escrow):
+    controller = GaugeController.deploy(voting_escrow, {'from': accounts[0]})
+    controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    for i in range(N_GAUGES):
+        controller.add_gauge(f"0x{i + 1:040x}", 0, (i + 1) * 10 ** 18, {"from": accounts[0]})
+    yield controller
+
+@pytest.fixture(scope="module")
+def gauge_helper(GaugeHelper, accounts, gauge_controller):
+    yield GaugeHelper.deploy(gauge_controller, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def client(gauge_helper, gauge_controller):
+    yield GaugeHelperClient(gauge_helper, gauge_controller)
+
+def test_relative_weights(chain, gauge_controller, client):
+    chain.sleep(2 * WEEK)
+    chain.mine()
+    gauges = client.gauges()
+
+    start = time.perf_counter()
+    expected = {g: gauge_controller.gauge_relative_weight(g, chain.time()) for g in gauges}
+    per_gauge_latency = time.perf_counter() - start
+
+    start = time.perf_counter()
+    weights = client.relative_weights(gauges, chain.time())
+    batch_latency = time.perf_counter() - start
+
+    print(f"relative weights of {len(gauges)} gauges: {per_gauge_latency:.3f}s per gauge path, {batch_latency:.3f}s batch")
+    assert weights == expected
+    assert sum(weights.values()) <= 10 ** 18
+
+def test_relative_weights_past(chain, gauge_controller, client):
+    gauges = client.gauges()
+    times = [chain.time() - (i % 3) * WEEK for i in range(len(gauges))]
+    weights = client.relative_weights(gauges, times)
+
+    for gauge, t in zip(gauges, times):
+        assert weights[gauge] == gauge_controller.gauge_relative_weight(gauge, t)
+
+def test_checkpoint_gas(accounts, chain, gauge_controller, client):
+    chain.sleep(5 * WEEK)
+    chain.mine()
+    gauges = client.gauges()
+    chain.snapshot()
+
+    start = time.perf_counter()
+    per_gauge_gas = gauge_controller.checkpoint({"from": accounts[0]}).gas_used
+    for gauge in gauges:
+        per_gauge_gas += gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]}).gas_used
+    per_gauge_latency = time.perf_counter() - start
+    expected = [gauge_controller.time_weight(g) for g in gauges]
+
+    chain.revert()
+    start = time.perf_counter()
+    txs = client.checkpoint({"from": accounts[0]})
+    batch_latency = time.perf_counter() - start
+    batch_gas = sum(tx.gas_used for tx in txs)
+
+    print(f"checkpoint of {len(gauges)} gauges: {per_gauge_gas} gas / {per_gauge_latency:.3f}s per gauge path, {batch_gas} gas / {batch_latency:.3f}s batch")
+    assert len(txs) == 1
+    assert [gauge_controller.time_weight(g) for g in gauges] == expected
+    # batching saves the 21000 base cost of each extra transaction, less the
+    # call from the helper to the controller
+    assert per_gauge_gas - batch_gas > len(gauges) * 18000
+
+def test_checkpoint_gas_budget(accounts, chain, gauge_controller, gauge_helper, client):
+    chain.sleep(5 * WEEK)
+    chain.mine()
+    gauges = client.gauges()
+
+    txs = client.checkpoint({"from": accounts[0]}, gauges, gas_budget=300_000)
+
+    assert len(txs) > 1
+    for tx in txs:
+        assert gauge_helper.checkpoint_gauges.decode_input(tx.input)[1] == 300_000
+    next_time = (chain.time() + WEEK) // WEEK * WEEK
+    assert all(gauge_controller.time_weight(g) == next_time for g in gauges)
+
+def test_checkpoint_gas_budget_below_overhead(accounts, chain, gauge_controller, gauge_helper, client):
+    chain.sleep(5 * WEEK)
+    chain.mine()
+    gauges = client.gauges()
+
+    # a budget already spent before the first gauge still checkpoints one
+    assert gauge_helper.checkpoint_gauges.call(gauges + [ZERO_ADDRESS] * (32 - len(gauges)), 1) == 1
+    txs = client.checkpoint({"from": accounts[0]}, gauges, gas_budget=1)
+
+    assert len(txs) == len(gauges)
+    next_time = (chain.time() + WEEK) // WEEK * WEEK
+    assert all(gauge_controller.time_weight(g) == next_time for g in gauges)
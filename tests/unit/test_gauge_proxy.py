@@ -0,0 +1,126 @@
+import brownie
+import pytest
+
+from brownie import ZERO_ADDRESS
+
+from scripts.gauge_proxy_batch import build_batches
+
+N_GAUGES = 13
+
+@pytest.fixture(scope="module")
+def fake_idle(ERC20LP, accounts):
+    yield ERC20LP.deploy("Fake IDLE", "fIDLE", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def mock_lp_token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Idle YTP token", "YTP-LP", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def reward_token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Rewards", "RWRD", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def distributor(Distributor, fake_idle, accounts):
+    yield Distributor.deploy(fake_idle, accounts[0], accounts[0], {"from": accounts[0]})
+
+@pytest.fixture(scope="module")
+def voting_escrow(VotingEscrow, fake_idle, accounts):
+    yield VotingEscrow.deploy(fake_idle, 'Staked fIDLE', 'stkfIDLE', '1.0', {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauge_controller(GaugeController, accounts, voting_escrow):
+    yield GaugeController.deploy(voting_escrow, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def distributor_proxy(DistributorProxy, accounts, gauge_controller, distributor):
+    yield DistributorProxy.deploy(distributor, gauge_controller, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def gauge_proxy(GaugeProxy, accounts):
+    yield GaugeProxy.deploy(accounts[0], accounts[1], {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def multirewards(MultiRewards, accounts, mock_lp_token, reward_token):
+    contract = MultiRewards.deploy({"from": accounts[0]})
+    contract.initialize(accounts[0], mock_lp_token, {"from": accounts[0]})
+    contract.addReward(reward_token, accounts[0], 7 * 86400, True, {"from": accounts[0]})
+    yield contract
+
+@pytest.fixture(scope="module")
+def gauges(LiquidityGaugeV3, accounts, mock_lp_token, distributor_proxy, gauge_proxy):
+    yield [
+        LiquidityGaugeV3.deploy(mock_lp_token, distributor_proxy, gauge_proxy, {"from": accounts[0]})
+        for i in range(N_GAUGES)
+    ]
+
+def test_set_killed_many(accounts, chain, gauge_proxy, gauges):
+    manifest = {"gauges": [{"address": g.address, "killed": True} for g in gauges]}
+    (method, args), = build_batches(manifest)
+    assert method == "set_killed_many"
+
+    chain.snapshot()
+    single_gas = sum(gauge_proxy.set_killed(g, True, {"from": accounts[1]}).gas_used for g in gauges)
+    chain.revert()
+
+    tx = gauge_proxy.set_killed_many(*args, {"from": accounts[1]})
+    print(f"set_killed on {len(gauges)} gauges: {tx.gas_used} gas batched, {single_gas} gas one by one")
+    assert all(g.is_killed() for g in gauges)
+    assert tx.gas_used < single_gas - (len(gauges) - 1) * 21000
+
+    (_, args), = build_batches({"gauges": [{"address": g.address, "killed": False} for g in gauges]})
+    gauge_proxy.set_killed_many(*args, {"from": accounts[0]})
+    assert not any(g.is_killed() for g in gauges)
+
+def test_set_rewards_many(accounts, chain, gauge_proxy, gauges, multirewards, reward_token):
+    manifest = {
+        "gauges": [
+            {
+                "address": g.address,
+                "reward_contract": multirewards.address,
+                "reward_tokens": [reward_token.address],
+                "sigs": [None, None, "getReward()"],
+            }
+            for g in gauges
+        ]
+    }
+    (method, args), = build_batches(manifest)
+    assert method == "set_rewards_many"
+
+    chain.snapshot()
+    single_gas = sum(
+        gauge_proxy.set_rewards(g, *[a[i] for a in args[1:]], {"from": accounts[0]}).gas_used
+        for i, g in enumerate(gauges)
+    )
+    chain.revert()
+
+    tx = gauge_proxy.set_rewards_many(*args, {"from": accounts[0]})
+    print(f"set_rewards on {len(gauges)} gauges: {tx.gas_used} gas batched, {single_gas} gas one by one")
+    assert all(g.reward_contract() == multirewards for g in gauges)
+    assert all(g.reward_tokens(0) == reward_token for g in gauges)
+    assert tx.gas_used < single_gas - (len(gauges) - 1) * 21000
+
+def test_transfer_ownership_many(GaugeProxy, accounts, gauge_proxy, gauges):
+    new_proxy = GaugeProxy.deploy(accounts[0], accounts[1], {"from": accounts[0]})
+    manifest = {"gauges": [{"address": g.address} for g in gauges], "new_owner": new_proxy.address}
+    (method, args), = build_batches(manifest)
+    assert method == "commit_transfer_ownership_many"
+
+    gauge_proxy.commit_transfer_ownership_many(*args, {"from": accounts[0]})
+    assert all(g.future_admin() == new_proxy for g in gauges)
+
+    new_proxy.accept_transfer_ownership_many(args[0], {"from": accounts[2]})
+    assert all(g.admin() == new_proxy for g in gauges)
+
+@pytest.mark.parametrize("method,idx", [
+    ("commit_transfer_ownership_many", 1),
+    ("set_killed_many", 2),
+    ("set_rewards_many", 1),
+])
+def test_batch_access_denied(accounts, gauge_proxy, gauges, method, idx):
+    args = {
+        "commit_transfer_ownership_many": ([ZERO_ADDRESS] * 20, accounts[3]),
+        "set_killed_many": ([ZERO_ADDRESS] * 20, [False] * 20),
+        "set_rewards_many": ([ZERO_ADDRESS] * 20, [ZERO_ADDRESS] * 20, ["0x" + "00" * 32] * 20, [[ZERO_ADDRESS] * 8] * 20),
+    }[method]
+    with brownie.reverts("Access denied"):
+        getattr(gauge_proxy, method)(*args, {"from": accounts[idx]})
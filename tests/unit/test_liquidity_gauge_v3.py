@@ -1,5 +1,7 @@
 import pytest
 
+from brownie import ZERO_ADDRESS
+
 from random import random, randrange
 
 MAX_UINT256 = 2 ** 256 - 1
@@ -239,4 +241,157 @@ def test_mining_with_votelock(
     rewards_bob = gauge_v3.integrate_fraction(bob)
     d_alice = rewards_alice - old_rewards_alice
     d_bob = rewards_bob - old_rewards_bob
-    assert d_alice == d_bob
\ No newline at end of file
+    assert d_alice == d_bob
+
+@pytest.mark.parametrize("n_rewards", [1, 2, 4, 8])
+def test_checkpoint_rewards(MultiRewards, ERC20LP, accounts, chain, mock_lp_token, gauge_v3, n_rewards):
+    admin, alice, bob = accounts[:3]
+    reward_tokens = [
+        ERC20LP.deploy(f"Reward {i}", f"RWRD{i}", 18, 10 ** 9, {"from": admin}) for i in range(n_rewards)
+    ]
+
+    multirewards = MultiRewards.deploy({"from": admin})
+    multirewards.initialize(admin, mock_lp_token, {"from": admin})
+    for token in reward_tokens:
+        multirewards.addReward(token, admin, 4 * WEEK, True, {"from": admin})
+        token.approve(multirewards, MAX_UINT256, {"from": admin})
+        multirewards.depositReward(token, 10 ** 24, {"from": admin})
+
+    for user in (alice, bob):
+        mock_lp_token.transfer(user, 10 ** 22, {"from": admin})
+        mock_lp_token.approve(gauge_v3, MAX_UINT256, {"from": user})
+        gauge_v3.deposit(10 ** 21, {"from": user})
+
+    sigs = [
+        multirewards.stake.signature[2:],
+        multirewards.withdraw.signature[2:],
+        multirewards.getReward.signature[2:],
+    ]
+    sigs = f"0x{sigs[0]}{sigs[1]}{sigs[2]}{'00' * 20}"
+    gauge_v3.set_rewards(multirewards, sigs, reward_tokens + [ZERO_ADDRESS] * (8 - n_rewards), {"from": admin})
+
+    # reference accounting built from the tokens the gauge received:
+    # reward_integral += received * 1e18 / total_supply
+    # claimable += balance * (reward_integral - reward_integral_for) / 1e18
+    integral = {t: gauge_v3.reward_integral(t) for t in reward_tokens}
+    claimable = {(u, t): 0 for u in (alice, bob) for t in reward_tokens}
+    integral_for = {(u, t): 0 for u in (alice, bob) for t in reward_tokens}
+
+    def checkpoint_model(users, balances, received, total_supply):
+        for token in reward_tokens:
+            integral[token] += 10 ** 18 * received[token] // total_supply
+        for user in users:
+            for token in reward_tokens:
+                claimable[(user, token)] += balances[user] * (integral[token] - integral_for[(user, token)]) // 10 ** 18
+                integral_for[(user, token)] = integral[token]
+
+    actions = [
+        ("deposit", alice, lambda: gauge_v3.deposit(10 ** 20, {"from": alice}), [alice]),
+        ("withdraw", bob, lambda: gauge_v3.withdraw(10 ** 19, {"from": bob}), [bob]),
+        ("transfer", alice, lambda: gauge_v3.transfer(bob, 10 ** 19, {"from": alice}), [alice, bob]),
+    ]
+    gas = {}
+    for i in range(6):
+        name, user, action, checkpointed = actions[i % 3]
+        chain.sleep(7200)
+        balances = {u: gauge_v3.balanceOf(u) for u in (alice, bob)}
+        total_supply = gauge_v3.totalSupply()
+        received = {t: -t.balanceOf(gauge_v3) for t in reward_tokens}
+        gas.setdefault(name, []).append(action().gas_used)
+        for token in reward_tokens:
+            received[token] += token.balanceOf(gauge_v3)
+        # every action claims, they are two hours apart
+        assert all(received[t] > 0 for t in reward_tokens)
+        checkpoint_model(checkpointed, balances, received, total_supply)
+
+        for token in reward_tokens:
+            assert gauge_v3.reward_integral(token) == integral[token]
+        for u in (alice, bob):
+            for token in reward_tokens:
+                assert gauge_v3.reward_integral_for(token, u) == integral_for[(u, token)]
+                assert gauge_v3.claimable_reward(u, token) == claimable[(u, token)]
+                assert gauge_v3.claimed_reward(u, token) == 0
+
+    print(f"{n_rewards} reward tokens:", {name: sum(g) // len(g) for name, g in gas.items()})
+
+    for user in (alice, bob):
+        gauge_v3.claim_rewards({"from": user})
+        for token in reward_tokens:
+            assert gauge_v3.claimable_reward(user, token) == 0
+            assert token.balanceOf(user) == gauge_v3.claimed_reward(user, token) >= claimable[(user, token)]
+
+def test_integrate_fraction_exact(accounts, chain, mock_lp_token, gauge_v3, gauge_controller):
+    admin = accounts[0]
+    users = accounts[1:4]
+
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": admin})
+    gauge_controller.add_gauge(gauge_v3, 0, 10 ** 18, {"from": admin})
+    gauge_controller.add_gauge(accounts[9], 0, 3 * 10 ** 18, {"from": admin})
+    for user in users:
+        mock_lp_token.transfer(user, 10 ** 22, {"from": admin})
+        mock_lp_token.approve(gauge_v3, MAX_UINT256, {"from": user})
+
+    def expected_integral(period_time, integral, working_supply, rate, new_rate, future_epoch, t):
+        # same integer math as `_checkpoint`, one controller read per week
+        prev_week_time = period_time
+        week_time = min((period_time + WEEK) // WEEK * WEEK, t)
+        while True:
+            w = gauge_controller.gauge_relative_weight(gauge_v3, prev_week_time // WEEK * WEEK)
+            if working_supply > 0:
+                if prev_week_time <= future_epoch < week_time:
+                    integral += rate * w * (future_epoch - prev_week_time) // working_supply
+                    rate = new_rate
+                    integral += rate * w * (week_time - future_epoch) // working_supply
+                else:
+                    integral += rate * w * (week_time - prev_week_time) // working_supply
+            if week_time == t:
+                return integral
+            prev_week_time = week_time
+            week_time = min(week_time + WEEK, t)
+
+    gas_same_week = []
+    gas_new_week = []
+    cached_week = 0
+    for i in range(30):
+        # mostly deposits within the same week, sometimes weeks apart
+        week = chain.time() // WEEK
+        chain.sleep(randrange(1, 3 * WEEK) if random() < 0.3 else randrange(1, 3600))
+        user = users[randrange(len(users))]
+        if random() < 0.3:
+            # new weights apply from next week, the current one stays final
+            gauge = gauge_v3 if random() < 0.5 else accounts[9]
+            gauge_controller.change_gauge_weight(gauge, randrange(1, 10) * 10 ** 18, {"from": admin})
+
+        period = gauge_v3.period()
+        period_time = gauge_v3.period_timestamp(period)
+        integral = gauge_v3.integrate_inv_supply(period)
+        working_supply = gauge_v3.working_supply()
+        working_balance = gauge_v3.working_balances(user)
+        rate = gauge_v3.inflation_rate()
+        future_epoch = gauge_v3.future_epoch_time()
+        fraction = gauge_v3.integrate_fraction(user)
+        inv_supply_of = gauge_v3.integrate_inv_supply_of(user)
+
+        if gauge_v3.balanceOf(user) > 0 and random() < 0.3:
+            tx = gauge_v3.withdraw(randrange(1, gauge_v3.balanceOf(user) + 1), {"from": user})
+        else:
+            tx = gauge_v3.deposit(randrange(1, 10 ** 21), {"from": user})
+        (gas_same_week if tx.timestamp // WEEK == week else gas_new_week).append(tx.gas_used)
+
+        # the controller is checkpointed once a week, then the cached weight is used
+        this_week = tx.timestamp // WEEK * WEEK
+        if tx.timestamp > period_time:
+            calls = [c for c in tx.subcalls if c.get("function") == "checkpoint_gauge(address)"]
+            assert len(calls) == (cached_week != this_week)
+            if period_time // WEEK * WEEK == this_week or tx.timestamp > this_week:
+                cached_week = this_week
+
+        if future_epoch < period_time:
+            future_epoch = 0  # rate is not updated
+        integral = expected_integral(
+            period_time, integral, working_supply, rate, gauge_v3.inflation_rate(), future_epoch, tx.timestamp
+        )
+        assert gauge_v3.integrate_inv_supply(period + 1) == integral
+        assert gauge_v3.integrate_fraction(user) == fraction + working_balance * (integral - inv_supply_of) // 10 ** 18
+
+    print(f"deposit/withdraw gas: {sum(gas_same_week) // max(len(gas_same_week), 1)} same week, {sum(gas_new_week) // max(len(gas_new_week), 1)} new week")
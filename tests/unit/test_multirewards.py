@@ -0,0 +1,140 @@
+import pytest
+
+from brownie.test import given, strategy
+
+MAX_UINT256 = 2 ** 256 - 1
+WEEK = 7 * 86400
+
+@pytest.fixture(scope="module")
+def staking_token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Idle YTP token", "YTP-LP", 18, 10 ** 9, {'from': accounts[0]})
+
+@pytest.fixture(scope="module")
+def reward_tokens(ERC20LP, accounts):
+    yield [
+        ERC20LP.deploy(f"Reward {i}", f"RWRD{i}", 18, 10 ** 9, {'from': accounts[0]})
+        for i in range(8)
+    ]
+
+def deploy_multirewards(MultiRewards, accounts, staking_token, reward_tokens, durations):
+    admin = accounts[0]
+    multirewards = MultiRewards.deploy({"from": admin})
+    multirewards.initialize(admin, staking_token, {"from": admin})
+    for token, duration in zip(reward_tokens, durations):
+        multirewards.addReward(token, admin, duration, True, {"from": admin})
+        token.approve(multirewards, MAX_UINT256, {"from": admin})
+        multirewards.depositReward(token, 10 ** 24, {"from": admin})
+    for user in accounts[1:4]:
+        staking_token.transfer(user, 10 ** 24, {"from": admin})
+        staking_token.approve(multirewards, MAX_UINT256, {"from": user})
+    return multirewards
+
+
+class RewardsModel:
+    """
+    Reference accounting of the original `updateReward` modifier, which
+    rewrote every field for every token on each call
+    """
+
+    def __init__(self, multirewards, tokens):
+        self.tokens = tokens
+        self.data = {}
+        for token in tokens:
+            _, _, _, period_finish, rate, last_update, stored = multirewards.rewardData(token)
+            self.data[token] = [period_finish, rate, last_update, stored]
+        self.balances = {}
+        self.supply = 0
+        self.paid = {}
+        self.rewards = {}
+
+    def reward_per_token(self, token, t):
+        period_finish, rate, last_update, stored = self.data[token]
+        if self.supply == 0:
+            return stored
+        return stored + (min(t, period_finish) - last_update) * rate * 10 ** 18 // self.supply
+
+    def earned(self, user, token, t):
+        paid = self.paid.get((user, token), 0)
+        balance = self.balances.get(user, 0)
+        return balance * (self.reward_per_token(token, t) - paid) // 10 ** 18 + self.rewards.get((user, token), 0)
+
+    def update(self, user, t):
+        for token in self.tokens:
+            self.data[token][3] = self.reward_per_token(token, t)
+            self.data[token][2] = min(t, self.data[token][0])
+            self.rewards[(user, token)] = self.earned(user, token, t)
+            self.paid[(user, token)] = self.data[token][3]
+
+    def stake(self, user, amount, t):
+        self.update(user, t)
+        self.balances[user] = self.balances.get(user, 0) + amount
+        self.supply += amount
+
+    def withdraw(self, user, amount, t):
+        self.update(user, t)
+        self.balances[user] -= amount
+        self.supply -= amount
+
+    def get_reward(self, user, t):
+        self.update(user, t)
+        for token in self.tokens:
+            self.rewards[(user, token)] = 0
+
+
+@given(
+    actions=strategy("uint8[12]"),
+    amounts=strategy("uint256[12]", min_value=1, max_value=10 ** 21),
+    sleeps=strategy("uint256[12]", max_value=WEEK),
+)
+def test_earned_matches_reference(MultiRewards, accounts, chain, staking_token, reward_tokens, actions, amounts, sleeps):
+    tokens = reward_tokens[:3]
+    multirewards = deploy_multirewards(MultiRewards, accounts, staking_token, tokens, [WEEK, 2 * WEEK, WEEK // 2])
+    model = RewardsModel(multirewards, tokens)
+    users = accounts[1:4]
+
+    for action, amount, sleep in zip(actions, amounts, sleeps):
+        chain.sleep(sleep)
+        user = users[action % 3]
+        balance = multirewards.balanceOf(user)
+
+        if action // 3 % 3 == 1 and balance > 0:
+            amount = amount % balance + 1
+            tx = multirewards.withdraw(amount, {"from": user})
+            model.withdraw(user, amount, tx.timestamp)
+        elif action // 3 % 3 == 2:
+            tx = multirewards.getReward({"from": user})
+            model.get_reward(user, tx.timestamp)
+        else:
+            tx = multirewards.stake(amount, {"from": user})
+            model.stake(user, amount, tx.timestamp)
+
+        for u in users:
+            for token in tokens:
+                earned = multirewards.earned.call(u, token, block_identifier=tx.block_number)
+                assert earned == model.earned(u, token, tx.timestamp)
+                if u == user:
+                    assert multirewards.rewards(u, token) == model.rewards[(u, token)]
+                    assert multirewards.userRewardPerTokenPaid(u, token) == model.paid[(u, token)]
+
+
+@pytest.mark.parametrize("n_tokens", [1, 2, 4, 8])
+def test_update_reward_gas(MultiRewards, accounts, chain, staking_token, reward_tokens, n_tokens):
+    alice, bob = accounts[1:3]
+    multirewards = deploy_multirewards(MultiRewards, accounts, staking_token, reward_tokens[:n_tokens], [WEEK] * n_tokens)
+    multirewards.stake(10 ** 18, {"from": alice})
+    multirewards.stake(10 ** 18, {"from": bob})
+
+    chain.sleep(WEEK // 2)
+    active_gas = multirewards.stake(10 ** 18, {"from": alice}).gas_used
+
+    # the first call after the end of the period accrues the tail of it,
+    # the following ones have nothing left to write
+    chain.sleep(WEEK)
+    multirewards.stake(10 ** 18, {"from": alice})
+    inactive_gas = multirewards.stake(10 ** 18, {"from": alice}).gas_used
+    get_reward_gas = multirewards.getReward({"from": bob}).gas_used
+    idle_get_reward_gas = multirewards.getReward({"from": bob}).gas_used
+
+    print(f"{n_tokens} tokens: stake {active_gas} gas active, {inactive_gas} gas finished; getReward {get_reward_gas} gas, {idle_get_reward_gas} gas when up to date")
+    assert inactive_gas < active_gas
+    assert idle_get_reward_gas < get_reward_gas
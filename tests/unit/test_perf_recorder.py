@@ -0,0 +1,50 @@
+import pytest
+
+from brownie import web3
+from conftest import PerfRecorder, over_budget
+
+@pytest.fixture(scope="module")
+def token(ERC20LP, accounts):
+    yield ERC20LP.deploy("Idle YTP token", "YTP-LP", 18, 10 ** 9, {'from': accounts[0]})
+
+def test_counts_transactions(accounts, chain, monkeypatch, pytestconfig, token):
+    # web3 has already cached its request function by now
+    token.balanceOf(accounts[0])
+
+    # the provider is shared with the rest of the session, restore it afterwards
+    provider = web3.provider
+    make_request = provider.make_request
+    monkeypatch.setattr(provider, "make_request", provider.make_request)
+    monkeypatch.setattr(provider, "_request_func_cache", provider._request_func_cache)
+
+    recorder = PerfRecorder(pytestconfig)
+    recorder._count_requests()
+    height = chain.height
+
+    token.transfer(accounts[1], 10 ** 18, {"from": accounts[0]})
+    token.approve(accounts[1], 10 ** 18, {"from": accounts[0]})
+    assert token.balanceOf(accounts[1]) == 10 ** 18
+    chain.mine()
+
+    calls = recorder._calls
+    assert calls["eth_sendTransaction"] == 2
+    assert calls["eth_call"] >= 1
+    assert calls["eth_getTransactionReceipt"] >= 2
+    assert calls["evm_mine"] == 1
+    assert chain.height - height == calls["eth_sendTransaction"] + calls["evm_mine"]
+
+    monkeypatch.undo()
+    assert provider.make_request == make_request
+    total = sum(calls.values())
+    token.balanceOf(accounts[0])
+    assert sum(calls.values()) == total
+
+def test_over_budget():
+    metrics = {"rpc_calls": 120, "time": 2.0}
+
+    assert over_budget(metrics, {"rpc_calls": 110, "time": 2.0}, 0.1, 0.5) == []
+    assert over_budget(metrics, {"rpc_calls": 100, "time": 2.0}, 0.1, 0.5) == [("rpc_calls", 120, 110)]
+    assert over_budget(metrics, {"rpc_calls": 100, "rpc_tolerance": 0.5}, 0.1, 0.5) == []
+    assert over_budget(metrics, {"time": 0.5}, 0.1, 0.5) == [("time", 2.0, 1.75)]
+    # tolerance overrides alone do not make a budget
+    assert over_budget(metrics, {"rpc_tolerance": 0.0}, 0.1, 0.5) == []